@@ -0,0 +1,188 @@
+"""
+Headless batch audit: stream a roster CSV in and result rows out.
+
+    python batch_audit.py roster.csv --output results.csv
+    python batch_audit.py roster.csv --output results.jsonl --format jsonl --extra-domains zocdoc.com
+    python batch_audit.py roster.csv --output results.parquet --format parquet
+
+The roster is read in chunks and only a bounded number of doctors are in
+flight at once, so memory stays flat regardless of roster size. Results
+are written as each doctor completes and are journaled, so re-running
+the same command after a crash resumes where it stopped.
+"""
+import argparse
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+
+import pandas as pd
+
+from config import DEFAULT_DIRECTORIES, MAX_SEARCH_RESULTS, MAX_DOCTOR_WORKERS, MAX_SCRAPE_WORKERS, BATCH_CHUNK_SIZE
+from utils.search_engine import SearchEngine
+from utils.comparison import ProfileComparator
+from utils.checkpoint import CheckpointJournal, compute_audit_id, digest_roster_file
+from utils.scrape_dedup import SingleFlightScrapes
+from utils.audit_runner import process_doctor_profile, build_doctor_error_results, REQUIRED_COLUMNS
+from utils.export import EXPORT_WRITERS, open_export_file
+from scrapers.http_fetcher import get_http_fetcher
+from scrapers.resource_blocking import get_page_load_stats
+from utils.concurrency import get_scheduler
+from utils.metrics import get_metrics
+
+logger = logging.getLogger("batch_audit")
+
+def iter_roster(path, chunk_size):
+    """Yield roster records one at a time, reading the CSV in chunks"""
+    for chunk_number, chunk in enumerate(pd.read_csv(path, chunksize=chunk_size)):
+        if chunk_number == 0:
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing_columns:
+                raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+        
+        for _, doctor_data in chunk.iterrows():
+            yield doctor_data
+
+def run_batch_audit(roster_path, output, domains, output_format='csv', doctor_workers=MAX_DOCTOR_WORKERS,
+                    scrape_workers=MAX_SCRAPE_WORKERS, chunk_size=BATCH_CHUNK_SIZE, resume=True):
+    """Run an audit over a roster file, streaming results to an open file in the format's mode"""
+    search_engine = SearchEngine(max_results=MAX_SEARCH_RESULTS)
+    comparator = ProfileComparator()
+    writer = EXPORT_WRITERS[output_format](output)
+    scrapes = SingleFlightScrapes()
+    
+    audit_id = compute_audit_id(digest_roster_file(roster_path), domains)
+    journal = CheckpointJournal(audit_id)
+    if not resume:
+        journal.reset()
+    elif journal.completed_count():
+        logger.info(f"Resuming audit {audit_id}: {journal.completed_count()} results already completed")
+    
+    # Keep a bounded window of doctors in flight so memory doesn't grow with the roster
+    max_in_flight = doctor_workers * 2
+    doctors_done = 0
+    rows_written = 0
+    
+    def drain(in_flight, return_when):
+        nonlocal doctors_done, rows_written
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            doctor_data = in_flight.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                # Still write the doctor's rows so every roster row shows up in the output
+                logger.error(f"Error processing {doctor_data['Name']}: {str(e)}")
+                results = build_doctor_error_results(doctor_data, domains, str(e))
+            
+            for result in results:
+                writer.write(result)
+            rows_written += len(results)
+            doctors_done += 1
+        
+        output.flush()
+        windows = ', '.join(f"{host}={window['window']:.1f}" for host, window in get_scheduler().snapshot().items())
+        logger.info(f"Completed {doctors_done} doctors, {rows_written} result rows written; windows: {windows}")
+    
+    try:
+        with ThreadPoolExecutor(max_workers=doctor_workers) as doctor_executor, \
+                ThreadPoolExecutor(max_workers=scrape_workers) as scrape_executor:
+            in_flight = {}
+            for doctor_data in iter_roster(roster_path, chunk_size):
+                if len(in_flight) >= max_in_flight:
+                    drain(in_flight, FIRST_COMPLETED)
+                
+                future = doctor_executor.submit(
+                    process_doctor_profile,
+                    doctor_data, domains, search_engine, comparator, scrape_executor, journal, scrapes
+                )
+                in_flight[future] = doctor_data
+            
+            if in_flight:
+                drain(in_flight, ALL_COMPLETED)
+    finally:
+        journal.close()
+        writer.close()
+    
+    scrape_stats = scrapes.stats()
+    logger.info(
+        f"Profile scrapes: {scrape_stats['fetches']} fetched, "
+        f"{scrape_stats['reused'] + scrape_stats['joined']} shared with other rows"
+    )
+    for domain, counts in get_http_fetcher().stats.report().items():
+        logger.info(
+            f"{domain}: {counts['http']} via HTTP, {counts['browser']} escalated to browser "
+            f"({counts['escalation_rate']:.0%})"
+        )
+    for host, window in get_scheduler().snapshot().items():
+        logger.info(
+            f"{host}: concurrency window {window['window']:.1f}, {window['throttled']} throttled, "
+            f"{window['retries']} retries"
+        )
+    for domain, counts in get_page_load_stats().report().items():
+        logger.info(
+            f"{domain}: {counts['pages']} browser pages, {counts['avg_kb']:.0f} KB and "
+            f"{counts['avg_load_seconds']:.2f}s per page"
+        )
+    
+    return doctors_done, rows_written
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a doctor directory audit without the Streamlit UI")
+    parser.add_argument("roster", help="Roster CSV with Name, Location and Website columns")
+    parser.add_argument("--output", "-o", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=sorted(EXPORT_WRITERS), default="csv", help="Output format")
+    parser.add_argument("--domains", help="Comma-separated domains to search instead of the defaults")
+    parser.add_argument("--extra-domains", help="Comma-separated domains to search in addition to the defaults")
+    parser.add_argument("--doctor-workers", type=int, default=MAX_DOCTOR_WORKERS, help="Doctors processed in parallel")
+    parser.add_argument("--scrape-workers", type=int, default=MAX_SCRAPE_WORKERS, help="Concurrent profile scrapes")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="Roster rows read per chunk")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint and start over")
+    parser.add_argument("--metrics-out", help="Write stage timings here (.prom for Prometheus text, otherwise JSON)")
+    return parser.parse_args(argv)
+
+def split_domains(value):
+    return [domain.strip() for domain in value.split(',') if domain.strip()] if value else []
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    args = parse_args(argv)
+    
+    domains = split_domains(args.domains) or list(DEFAULT_DIRECTORIES)
+    domains += [domain for domain in split_domains(args.extra_domains) if domain not in domains]
+    
+    if args.output == "-":
+        if EXPORT_WRITERS[args.format].binary:
+            logger.error(f"--format {args.format} needs an --output file")
+            return 2
+        output = sys.stdout
+    else:
+        output = open_export_file(args.output, args.format)
+    
+    try:
+        doctors_done, rows_written = run_batch_audit(
+            args.roster, output, domains,
+            output_format=args.format,
+            doctor_workers=args.doctor_workers,
+            scrape_workers=args.scrape_workers,
+            chunk_size=args.chunk_size,
+            resume=not args.no_resume
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    logger.info(f"Audit finished: {doctors_done} doctors, {rows_written} result rows")
+    
+    metrics = get_metrics()
+    for row in metrics.summary():
+        logger.info(
+            f"{row['stage']}: {row['count']} spans, {row['total_seconds']:.1f}s total, "
+            f"p50 {row['p50'] * 1000:.0f} ms, p95 {row['p95'] * 1000:.0f} ms"
+        )
+    if args.metrics_out:
+        with open(args.metrics_out, 'w', encoding='utf-8') as f:
+            f.write(metrics.to_prometheus() if args.metrics_out.endswith('.prom') else metrics.to_json())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Benchmarks for the audit pipeline
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Benchmark ProfileComparator throughput.
+
+    python -m benchmarks.bench_comparison --records 200 --profiles 15
+
+Compares every roster record against a set of scraped profiles using
+per-call compare_profiles() and, where available, the batched
+compare_many() API with and without threshold pruning.
+"""
+import argparse
+import random
+import string
+import time
+
+from utils.comparison import ProfileComparator
+
+FIRST_NAMES = ["John", "Sarah", "Michael", "Emily", "David", "Priya", "Wei", "Maria", "James", "Aisha"]
+LAST_NAMES = ["Smith", "Johnson", "Brown", "Garcia", "Nguyen", "Patel", "Kim", "Lopez", "Miller", "Okafor"]
+CITIES = ["Towson MD", "Baltimore MD", "Annapolis MD", "Columbia MD", "Bethesda MD"]
+
+def make_roster(count, rng):
+    roster = []
+    for i in range(count):
+        name = f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        slug = name.lower().replace('dr. ', '').replace(' ', '-')
+        roster.append({
+            'Name': name,
+            'Location': rng.choice(CITIES),
+            'Website': f"https://www.practice{i}.com/{slug}",
+            'Phone': f"(410) 555-{rng.randint(0, 9999):04d}"
+        })
+    return roster
+
+def make_profiles(record, count, rng):
+    profiles = []
+    for i in range(count):
+        if i == 0:
+            name = record['Name'].upper()
+        else:
+            name = f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} " + ''.join(
+                rng.choice(string.ascii_lowercase) for _ in range(rng.randint(0, 12)))
+        profiles.append({
+            'name': name,
+            'phone': record['Phone'] if i == 0 else f"410-555-{rng.randint(0, 9999):04d}",
+            'website': record['Website'] if i % 3 == 0 else '',
+            'address': f"{rng.randint(1, 999)} Main St, {record['Location']}",
+            'specialty': 'Orthopedic Surgery',
+            'has_photo': bool(i % 2),
+            'directory': 'vitals.com',
+            'profile_url': f"https://www.vitals.com/doctors/{i}"
+        })
+    return profiles
+
+def measure(label, fn, comparisons):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed * 1000:9.1f} ms  {comparisons / elapsed:12,.0f} comparisons/s")
+    return elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--profiles", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    
+    rng = random.Random(args.seed)
+    roster = make_roster(args.records, rng)
+    workload = [(record, make_profiles(record, args.profiles, rng)) for record in roster]
+    comparisons = args.records * args.profiles
+    
+    comparator = ProfileComparator()
+    
+    def per_call():
+        for record, profiles in workload:
+            for profile in profiles:
+                comparator.compare_profiles(record, profile)
+    
+    baseline = measure("compare_profiles (per call)", per_call, comparisons)
+    
+    if hasattr(comparator, 'compare_many'):
+        def batched():
+            for record, profiles in workload:
+                comparator.compare_many(record, profiles)
+        
+        def pruned():
+            for record, profiles in workload:
+                comparator.compare_many(record, profiles, prune=True)
+        
+        elapsed = measure("compare_many", batched, comparisons)
+        print(f"{'':<32} {baseline / elapsed:9.2f}x vs per call")
+        elapsed = measure("compare_many (prune=True)", pruned, comparisons)
+        print(f"{'':<32} {baseline / elapsed:9.2f}x vs per call")
+
+if __name__ == "__main__":
+    main()
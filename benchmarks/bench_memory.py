@@ -0,0 +1,102 @@
+"""
+Benchmark the memory held by audit result rows.
+
+    python -m benchmarks.bench_memory --rows 20000
+
+Builds the same rows as slotted ComparisonResult records and as the
+nested dicts compare_profiles() used to return, both straight from the
+comparator and as restored from checkpoint journal JSON, and reports
+the bytes retained per row as measured by tracemalloc.
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from utils.comparison import ProfileComparator
+from utils.records import ComparisonResult
+from benchmarks.bench_comparison import make_roster, make_profiles
+
+DOMAINS = ["vitals.com", "healthgrades.com", "webmd.com", "doximity.com", "health.usnews.com"]
+
+def make_workload(rows, profiles_per_domain, seed):
+    """Roster records plus the scraped profiles each doctor turns up"""
+    rng = random.Random(seed)
+    doctors = max(1, rows // (len(DOMAINS) * profiles_per_domain))
+    workload = []
+    for record in make_roster(doctors, rng):
+        profiles = []
+        for domain in DOMAINS:
+            for profile in make_profiles(record, profiles_per_domain, rng):
+                # Scrapers build a fresh directory string for every profile
+                profile['directory'] = ''.join(domain)
+                profiles.append(profile)
+        workload.append((record, profiles))
+    return workload
+
+def retained_bytes(build):
+    """Bytes still allocated once build() returns, with its result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(kept)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--profiles", type=int, default=3, help="Profiles per doctor per directory")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    
+    comparator = ProfileComparator()
+    workload = make_workload(args.rows, args.profiles, args.seed)
+    
+    def records():
+        rows = []
+        for record, profiles in workload:
+            rows.extend(comparator.compare_many(record, profiles))
+        return rows
+    
+    def dicts():
+        rows = []
+        for record, profiles in workload:
+            rows.extend(result.to_dict() for result in comparator.compare_many(record, profiles))
+        return rows
+    
+    # Journal lines as a resumed audit reads them back
+    journal = [json.dumps(row) for row in dicts()]
+    prepared = {}
+    
+    def restored_records():
+        rows = []
+        for line in journal:
+            data = json.loads(line)
+            record = prepared.get(data['doctor_name'])
+            if record is None:
+                record = prepared[data['doctor_name']] = comparator.prepare_record({
+                    'Name': data['doctor_name'], 'Location': data['original_location'],
+                    'Website': data['original_website']
+                })
+            rows.append(ComparisonResult.from_dict(data, record))
+        return rows
+    
+    def restored_dicts():
+        return [json.loads(line) for line in journal]
+    
+    print(f"{'rows':<28} {'retained MB':>12} {'bytes/row':>10}")
+    for label, build in [
+        ("records", records),
+        ("dicts", dicts),
+        ("records (from journal)", restored_records),
+        ("dicts (from journal)", restored_dicts),
+    ]:
+        prepared.clear()
+        retained, rows = retained_bytes(build)
+        print(f"{label:<28} {retained / 1e6:12.1f} {retained / rows:10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Benchmark the audit pipeline end to end without touching the network.
+
+    python -m benchmarks.bench_pipeline --doctors 10 100 1000
+    python -m benchmarks.bench_pipeline --doctors 100 --latency-ms 150 --page-kb 200
+
+A local HTTP server plays every directory: profile fetches are routed to
+it through the HTTP tier's proxy setting, and it serves synthetic
+Vitals-like and generic profile pages with configurable latency and size.
+A fake search backend stands in for googlesearch.search. Each roster size
+runs in its own process so peak RSS is measured per size.
+"""
+import argparse
+import hashlib
+import json
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from config import MAX_DOCTOR_WORKERS, MAX_SCRAPE_WORKERS, MAX_SEARCH_RESULTS, EARLY_EXIT_SCORE
+from scrapers.base_scraper import BaseScraper
+from scrapers.http_fetcher import HttpFetcher, set_http_fetcher
+from utils.audit_runner import process_doctor_profile
+from utils.comparison import ProfileComparator
+from utils.rate_limiter import get_rate_limiter
+from utils.scrape_dedup import SingleFlightScrapes
+from utils.search_engine import SearchEngine
+from benchmarks.bench_comparison import make_roster
+
+VITALS_DOMAIN = "vitals.com"
+GENERIC_DOMAIN = "example-directory.com"
+
+def slugify(name):
+    return name.lower().replace('dr. ', '').replace(' ', '-')
+
+def make_unique_roster(count, rng):
+    """Roster whose doctors all have distinct names, so every profile URL is fetched"""
+    roster = make_roster(count, rng)
+    for i, record in enumerate(roster):
+        initials, n = '', i
+        while True:
+            initials = chr(ord('A') + n % 26) + initials
+            n = n // 26 - 1
+            if n < 0:
+                break
+        first, last = record['Name'][len('Dr. '):].split(' ', 1)
+        record['Name'] = f"Dr. {first} {initials} {last}"
+    return roster
+
+def fake_phone(slug):
+    digits = int(hashlib.sha256(slug.encode('utf-8')).hexdigest()[:8], 16) % 10000
+    return f"(410) 555-{digits:04d}"
+
+def render_vitals_page(slug, padding):
+    name = "Dr. " + ' '.join(part.capitalize() for part in slug.split('-') if not part.isdigit())
+    return (
+        f"<html><head><title>{name} | Vitals</title></head><body>"
+        f"<h1 data-qa=\"doctor-name\">{name}</h1>"
+        f"<div data-qa=\"phone-number\">{fake_phone(slug)}</div>"
+        f"<div data-qa=\"practice-address\">1 Main St, Baltimore MD</div>"
+        f"<div data-qa=\"specialty\">Family Medicine</div>"
+        f"<a data-qa=\"website-link\" href=\"https://www.{slug}.com\">Website</a>"
+        f"<div class=\"doctor-photo\"><img src=\"/photos/{slug}.jpg\"></div>"
+        f"<!-- {padding} --></body></html>"
+    )
+
+def render_generic_page(slug, padding):
+    name = "Dr. " + ' '.join(part.capitalize() for part in slug.split('-') if not part.isdigit())
+    return (
+        f"<html><head><title>{name}</title></head><body>"
+        f"<p>Call {fake_phone(slug)} to book.</p><!-- {padding} --></body></html>"
+    )
+
+class FakeDirectoryHandler(BaseHTTPRequestHandler):
+    """Serve profile pages for proxied requests to any directory host"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        
+        # Proxied requests carry the absolute URL in the request line
+        parts = urlsplit(self.path)
+        host = (parts.hostname or self.headers.get('Host', '')).lower()
+        slug = parts.path.rstrip('/').rsplit('/', 1)[-1]
+        
+        if host.endswith(VITALS_DOMAIN):
+            body = render_vitals_page(slug, server.padding)
+        else:
+            body = render_generic_page(slug, server.padding)
+        
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_fake_directory(latency_ms=0, page_kb=30):
+    """Start the fake directory server on a free port; returns the server"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeDirectoryHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000.0
+    server.padding = 'x' * max(0, page_kb * 1024 - 600)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class FakeSearchBackend:
+    """
+    Stand-in for googlesearch.search
+    Returns each doctor's profile on every requested site, plus a tracking
+    parameter variant of the same URL, after a configurable delay. With
+    decoys, other doctors' profiles are ranked around the real one, the
+    first of them above it. Sites' results are interleaved, as a real
+    engine mixes them.
+    """
+    
+    def __init__(self, latency_ms=0, decoys=0):
+        self.latency = latency_ms / 1000.0
+        self.decoys = decoys
+    
+    def __call__(self, query, num_results=10):
+        if self.latency:
+            time.sleep(self.latency)
+        
+        name = query.split('"')[1]
+        slug = slugify(name)
+        domains = [word[len('site:'):] for word in query.split('"')[0].split() if word.startswith('site:')]
+        
+        per_site = []
+        for domain in domains:
+            url = f"http://www.{domain}/doctors/{slug}"
+            decoys = [
+                f"http://www.{domain}/doctors/decoy-{hashlib.sha256(f'{slug}{i}'.encode()).hexdigest()[:6]}"
+                for i in range(self.decoys)
+            ]
+            per_site.append(decoys[:1] + [url, f"{url}?utm_source=search"] + decoys[1:])
+        
+        results = [url for ranked in zip(*per_site) for url in ranked]
+        return results[:num_results]
+
+class StageTimer:
+    """Collect per-stage latencies from wrapped callables"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+    
+    def record(self, stage, elapsed):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(elapsed)
+    
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - started)
+        return timed
+    
+    def percentiles(self):
+        report = {}
+        for stage, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            report[stage] = {
+                'count': len(samples),
+                'p50_ms': samples[len(samples) // 2] * 1000,
+                'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+            }
+        return report
+
+def run_pipeline(doctors, latency_ms, page_kb, search_latency_ms, doctor_workers, scrape_workers, seed,
+                 combine_domains=True, decoys=2, early_exit=True):
+    """Run one roster through process_doctor_profile and return its measurements"""
+    server = start_fake_directory(latency_ms, page_kb)
+    proxy = f"http://127.0.0.1:{server.server_address[1]}"
+    set_http_fetcher(HttpFetcher(proxies={'http': proxy}, pool_maxsize=scrape_workers))
+    
+    # The fake directory has no politeness limits to respect
+    limiter = get_rate_limiter()
+    limiter.limits = {}
+    limiter.default_limit = (1e6, 1e6)
+    
+    timer = StageTimer()
+    search_engine = SearchEngine(max_results=MAX_SEARCH_RESULTS, use_cache=False, offline=False,
+                                 search_backend=FakeSearchBackend(search_latency_ms, decoys),
+                                 combine_domains=combine_domains)
+    # Each backend query is one sample, so combined multi-site queries show up as fewer searches
+    search_engine.run_search = timer.wrap('search', search_engine.run_search)
+    comparator = ProfileComparator()
+    comparator.compare_profiles = timer.wrap('compare', comparator.compare_profiles)
+    
+    # Scrapers are created per task, so their fetch and parse steps are timed at class level
+    original_fetch, original_parse = BaseScraper.fetch_profile, BaseScraper.parse_html
+    BaseScraper.fetch_profile = timer.wrap('fetch', original_fetch)
+    BaseScraper.parse_html = timer.wrap('parse', original_parse)
+    
+    roster = make_unique_roster(doctors, random.Random(seed))
+    domains = [VITALS_DOMAIN, GENERIC_DOMAIN]
+    scrapes = SingleFlightScrapes()
+    rows = 0
+    
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=doctor_workers) as doctor_executor, \
+                ThreadPoolExecutor(max_workers=scrape_workers) as scrape_executor:
+            process = timer.wrap('doctor', process_doctor_profile)
+            futures = [
+                doctor_executor.submit(
+                    process, doctor, domains, search_engine, comparator, scrape_executor, None, scrapes,
+                    EARLY_EXIT_SCORE if early_exit else None
+                )
+                for doctor in roster
+            ]
+            for future in as_completed(futures):
+                rows += len(future.result())
+    finally:
+        elapsed = time.perf_counter() - started
+        BaseScraper.fetch_profile, BaseScraper.parse_html = original_fetch, original_parse
+        server.shutdown()
+    
+    return {
+        'doctors': doctors,
+        'rows': rows,
+        'seconds': elapsed,
+        'doctors_per_minute': doctors / elapsed * 60,
+        'stages': timer.percentiles(),
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def print_report(result):
+    print(
+        f"{result['doctors']:>6} doctors  {result['rows']:>6} rows  {result['seconds']:8.2f} s  "
+        f"{result['doctors_per_minute']:10,.0f} doctors/min  peak RSS {result['peak_rss_mb']:7.1f} MB"
+    )
+    for stage, stats in result['stages'].items():
+        print(f"{'':>8}{stage:<10} n={stats['count']:<7} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--doctors", type=int, nargs='+', default=[10, 100, 1000], help="Roster sizes to run")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Fake directory response delay")
+    parser.add_argument("--page-kb", type=int, default=30, help="Fake profile page size")
+    parser.add_argument("--search-latency-ms", type=float, default=20, help="Fake search backend delay")
+    parser.add_argument("--doctor-workers", type=int, default=MAX_DOCTOR_WORKERS)
+    parser.add_argument("--scrape-workers", type=int, default=MAX_SCRAPE_WORKERS)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--per-domain-search", action="store_true", help="Search each directory with its own query")
+    parser.add_argument("--decoys", type=int, default=2, help="Other doctors' profiles returned with each search")
+    parser.add_argument("--no-early-exit", action="store_true", help="Scrape every candidate URL")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+    
+    options = [
+        "--latency-ms", str(args.latency_ms), "--page-kb", str(args.page_kb),
+        "--search-latency-ms", str(args.search_latency_ms), "--doctor-workers", str(args.doctor_workers),
+        "--scrape-workers", str(args.scrape_workers), "--seed", str(args.seed),
+        "--decoys", str(args.decoys),
+    ] + (["--per-domain-search"] if args.per_domain_search else []) + (["--no-early-exit"] if args.no_early_exit else [])
+    
+    results = []
+    if len(args.doctors) == 1:
+        results.append(run_pipeline(
+            args.doctors[0], args.latency_ms, args.page_kb, args.search_latency_ms,
+            args.doctor_workers, args.scrape_workers, args.seed, not args.per_domain_search,
+            args.decoys, not args.no_early_exit
+        ))
+    else:
+        # A fresh process per size keeps peak RSS from carrying over between runs
+        for doctors in args.doctors:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pipeline", "--doctors", str(doctors), "--json"] + options,
+                check=True, capture_output=True, text=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    
+    for result in results:
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print_report(result)
+
+if __name__ == "__main__":
+    main()
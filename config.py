@@ -12,9 +12,156 @@ DEFAULT_DIRECTORIES = [
 # Number of search results to check per directory
 MAX_SEARCH_RESULTS = 3
 
+# Search several directories with one OR'ed "site:" query, then fall back to
+# a per-directory query only for directories that query found nothing on
+SEARCH_COMBINE_DOMAINS = True
+SEARCH_MAX_SITES_PER_QUERY = 5
+SEARCH_MAX_QUERY_WORDS = 32  # Google ignores words past this limit
+
+# A directory's candidate URLs are scraped best-first, ranked by how well the
+# URL matches the doctor's name and location and by search rank. Once one
+# reaches EARLY_EXIT_SCORE (overall_score), the rest are skipped; None
+# scrapes every candidate
+EARLY_EXIT_SCORE = 0.8
+CANDIDATE_NAME_WEIGHT = 0.7
+CANDIDATE_LOCATION_WEIGHT = 0.1
+CANDIDATE_RANK_WEIGHT = 0.2
+
+# On-disk caches
+CACHE_DIR = ".cache"
+
+# Search result cache
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_PATH = f"{CACHE_DIR}/search_cache.sqlite3"
+SEARCH_CACHE_TTL = 7 * 24 * 3600  # Seconds a non-empty result stays fresh
+SEARCH_CACHE_NEGATIVE_TTL = 24 * 3600  # Seconds an empty result stays fresh
+SEARCH_CACHE_MAX_ENTRIES = 100000
+SEARCH_CACHE_TIMEOUT = 5.0  # Seconds to wait on another process's write lock before skipping the cache
+
+# Fetched page archive: "off", "record" (store every fetched page) or
+# "replay" (serve pages from the archive and never touch the network)
+ARCHIVE_MODE = "off"
+ARCHIVE_DIR = f"{CACHE_DIR}/pages"
+
+# Write-ahead journals used to resume interrupted audits
+CHECKPOINT_DIR = f"{CACHE_DIR}/checkpoints"
+
+# Shared job queue for running audits on separate worker processes (worker.py).
+# WAL needs shared memory, which only works between processes on one host; set
+# JOB_QUEUE_WAL = False when workers on other hosts open the file over a share
+JOB_QUEUE_PATH = f"{CACHE_DIR}/jobs.sqlite3"
+JOB_QUEUE_WAL = True
+JOB_LEASE_SECONDS = 300  # A claimed job returns to the queue if not renewed within this time
+JOB_MAX_ATTEMPTS = 3
+JOB_POLL_SECONDS = 2.0  # How often the UI and idle workers check the queue
+
+# Result exports written by the UI, and rows per Parquet row group / progress update
+EXPORT_DIR = f"{CACHE_DIR}/exports"
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_POLL_SECONDS = 0.5  # How often the UI reruns to update a running export's progress
+# Larger exports are offered by file path; Streamlit's default maxMessageSize is 200 MB
+EXPORT_DOWNLOAD_MAX_BYTES = 200 * 1024 * 1024
+
+# Rate limits as (requests per second, burst) per host; subdomains inherit
+# their parent domain's limit
+SEARCH_HOST = "google.com"
+RATE_LIMITS = {
+    "google.com": (0.5, 2),
+}
+DEFAULT_RATE_LIMIT = (2.0, 4)
+
+# Adaptive (AIMD) concurrency windows as (initial, maximum) requests in
+# flight per host. A window grows by one per window of successes and is
+# cut by AIMD_DECREASE_FACTOR on timeouts, 429/503s, CAPTCHA pages and
+# responses slower than AIMD_SLOW_RESPONSE_FACTOR times the host's average
+CONCURRENCY_LIMITS = {
+    "google.com": (1, 2),
+}
+DEFAULT_CONCURRENCY_LIMIT = (2, 16)
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_SLOW_RESPONSE_FACTOR = 3.0
+
+# Retries for throttled requests, with full-jitter exponential backoff
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0  # Seconds
+RETRY_MAX_DELAY = 30.0  # Seconds
+
+# Phrases that mark an anti-bot interstitial rather than a real page
+BLOCK_PAGE_MARKERS = [
+    "unusual traffic from your computer",
+    "are you a robot",
+    "verify you are a human",
+    "verify you are human",
+    "px-captcha",
+    "captcha-delivery.com",
+    "<title>just a moment...</title>",
+    "attention required! | cloudflare",
+    "checking your browser before accessing",
+]
+
+# Audit parallelism
+MAX_DOCTOR_WORKERS = 4  # Doctors processed concurrently
+MAX_SCRAPE_WORKERS = 8  # (domain, URL) profile scrapes in flight across all doctors
+SCRAPE_DEDUP_MAX_ENTRIES = 50000  # Scraped profiles kept for reuse by later rows in the same audit
+
+# Stage timing metrics (seconds); spans are aggregated into these histogram buckets
+METRICS_ENABLED = True
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+METRICS_RECENT_SPANS = 5000  # Individual spans kept with their doctor tag
+
+# Roster rows read per chunk by the batch CLI
+BATCH_CHUNK_SIZE = 500
+
+# Rows per page offered by the results table; only the current page is sent to the browser
+RESULTS_PAGE_SIZES = [50, 100, 250, 500]
+
+# Live results shown while an audit runs
+LIVE_RECENT_ROWS = 200  # Latest completed rows kept for the live table
+LIVE_REFRESH_SECONDS = 1.0  # Minimum time between redraws of the live panels
+
 # Selenium settings
 WEBDRIVER_TIMEOUT = 10
 PAGE_LOAD_TIMEOUT = 15
+PAGE_LOAD_STRATEGY = "eager"  # Return from driver.get() once the DOM is ready
+READINESS_MIN_TIMEOUT = 2  # Lower bound for the learned per-domain readiness timeout
+
+# Plain HTTP fetch tier (tried before falling back to Selenium)
+HTTP_TIMEOUT = 10
+HTTP_POOL_MAXSIZE = 8  # Keep-alive connections per domain
+HTTP_PROXIES = None  # requests-style proxies, e.g. {"http": "http://127.0.0.1:8080"}
+
+# Shared WebDriver pool settings
+DRIVER_POOL_SIZE = 4
+DRIVER_MAX_USES = 200  # Recycle a browser after this many checkouts
+
+# Resources the headless browser never downloads; extraction only needs the DOM
+BLOCK_RESOURCES = True
+BLOCKED_RESOURCES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3"],
+    "trackers": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*adservice.google.com*",
+        "*amazon-adsystem.com*",
+        "*adnxs.com*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*scorecardresearch.com*",
+        "*quantserve.com*",
+        "*criteo.com*",
+        "*taboola.com*",
+        "*outbrain.com*",
+        "*nr-data.net*",
+        "*segment.io*",
+    ],
+}
+# Per-domain exceptions: category names or individual patterns to let through,
+# e.g. {"example.com": ["fonts", "*.svg"]}
+RESOURCE_ALLOWLIST = {}
 
 # Fields to extract and compare
 PROFILE_FIELDS = [
@@ -1,14 +1,33 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import logging
-from io import StringIO
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from config import DEFAULT_DIRECTORIES, MAX_SEARCH_RESULTS
+from config import (
+    DEFAULT_DIRECTORIES, MAX_SEARCH_RESULTS, MAX_DOCTOR_WORKERS, MAX_SCRAPE_WORKERS, RESULTS_PAGE_SIZES,
+    JOB_POLL_SECONDS, EXPORT_POLL_SECONDS, EXPORT_DOWNLOAD_MAX_BYTES
+)
 from utils.search_engine import SearchEngine
 from utils.comparison import ProfileComparator
-from scrapers.scraper_factory import ScraperFactory
+from scrapers.http_fetcher import get_http_fetcher
+from scrapers.resource_blocking import get_page_load_stats
+from utils.checkpoint import CheckpointJournal, compute_audit_id, digest_roster, doctor_key
+from utils.scrape_dedup import SingleFlightScrapes
+from utils.concurrency import get_scheduler
+from utils.metrics import get_metrics
+from utils.live_results import LiveAuditResults
+from utils.export import ExportJob
+from utils.job_queue import get_job_queue
+from utils.records import ComparisonResult, RosterRecord
+from utils.audit_runner import (
+    process_doctor_profile, build_error_result, flatten_result, REQUIRED_COLUMNS, RESULT_COLUMNS
+)
+
+# Formats offered by the results export
+EXPORT_FORMATS = {"CSV": 'csv', "Parquet": 'parquet', "Excel": 'xlsx'}
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +39,22 @@ def init_session_state():
         st.session_state.audit_results = []
     if 'processing_complete' not in st.session_state:
         st.session_state.processing_complete = False
+    if 'escalation_report' not in st.session_state:
+        st.session_state.escalation_report = {}
+    if 'page_load_report' not in st.session_state:
+        st.session_state.page_load_report = {}
+    if 'audit_id' not in st.session_state:
+        st.session_state.audit_id = None
+    if 'results_view' not in st.session_state:
+        st.session_state.results_view = None
+    if 'results_exports' not in st.session_state:
+        st.session_state.results_exports = {}
+    if 'queued_audit' not in st.session_state:
+        st.session_state.queued_audit = None
 
 def validate_csv_columns(df):
     """Validate that CSV has required columns"""
-    required_columns = ['Name', 'Location', 'Website']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     
     if missing_columns:
         st.error(f"Missing required columns: {', '.join(missing_columns)}")
@@ -32,95 +62,233 @@ def validate_csv_columns(df):
         return False
     return True
 
-def process_doctor_profile(doctor_data, domains, search_engine, comparator):
-    """Process a single doctor's profile across all domains"""
-    doctor_name = doctor_data['Name']
-    location = doctor_data['Location']
+def render_concurrency_windows(placeholder):
+    """Show each host's live AIMD concurrency window"""
+    snapshot = get_scheduler().snapshot()
+    if not snapshot:
+        placeholder.caption("No requests made yet")
+        return
     
-    logger.info(f"Processing {doctor_name} in {location}")
+    placeholder.dataframe(
+        pd.DataFrame([
+            {
+                'Host': host,
+                'Window': window['window'],
+                'In Flight': window['in_flight'],
+                'Throttled': window['throttled'],
+                'Retries': window['retries']
+            }
+            for host, window in snapshot.items()
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def render_stage_timings(placeholder):
+    """Summarize where the last audit spent its time, slowest stage first"""
+    summary = get_metrics().summary()
+    if not summary:
+        placeholder.caption("No timings recorded yet")
+        return
     
-    # Search across all domains
-    search_results = search_engine.search_doctor_all_domains(doctor_name, location, domains)
+    placeholder.dataframe(
+        pd.DataFrame([
+            {
+                'Stage': row['stage'],
+                'Count': row['count'],
+                'Total (s)': round(row['total_seconds'], 2),
+                'p50 (ms)': round(row['p50'] * 1000, 1),
+                'p95 (ms)': round(row['p95'] * 1000, 1)
+            }
+            for row in summary
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
+
+def render_live_results(placeholder, live):
+    """Redraw the in-progress summary, per-directory health and latest rows"""
+    summary = live.summary()
+    with placeholder.container():
+        col_rows, col_matches, col_score = st.columns(3)
+        col_rows.metric("Profiles So Far", summary['rows'])
+        col_matches.metric("Name Matches", summary['matches'])
+        col_score.metric("Average Match Score", f"{summary['avg_score']:.2f}")
+        
+        if summary['failed_doctors']:
+            st.warning(f"{summary['failed_doctors']} of {summary['doctors']} doctors failed")
+        
+        health = live.domain_health()
+        if health:
+            health_df = pd.DataFrame(health)
+            health_df['Error Rate'] = (health_df['Error Rate'] * 100).round()
+            st.caption("Directory health")
+            st.dataframe(
+                health_df,
+                column_config={'Error Rate': st.column_config.ProgressColumn(format="%d%%", min_value=0, max_value=100)},
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        recent = live.recent_rows()
+        if recent:
+            st.caption(f"Latest {len(recent)} rows")
+            st.dataframe(pd.DataFrame(recent, columns=RESULT_COLUMNS), use_container_width=True, hide_index=True)
+
+def submit_queued_audit(df, roster_bytes, domains, resume):
+    """Queue a job per (doctor, domain) for the background workers and return the audit id"""
+    audit_id = compute_audit_id(digest_roster(roster_bytes), domains)
+    queue = get_job_queue()
+    if not resume:
+        queue.reset(audit_id)
     
-    profile_results = []
+    added = queue.enqueue(audit_id, [doctor_data.to_dict() for _, doctor_data in df.iterrows()], domains)
+    total = queue.progress(audit_id)['total']
+    if added < total:
+        st.info(f"Resuming audit {audit_id}: {total - added} of {total} jobs were already queued")
+    return audit_id
+
+def follow_queued_audit(audit_id, live_panel):
+    """
+    Poll a queued audit until every job has finished, streaming rows into the live panel
+    Only the queue is read here; the work runs in worker.py processes.
+    Any widget interaction reruns the script, which starts following the
+    audit again from its first finished job.
+    """
+    queue = get_job_queue()
+    live = LiveAuditResults()
+    all_results = []
+    records = {}
+    last_seq = 0
     
-    # Process each domain's results
-    for domain, urls in search_results.items():
-        if not urls:
-            # No results found for this domain
-            profile_results.append({
-                'doctor_name': doctor_name,
-                'original_location': location,
-                'original_website': doctor_data.get('Website', ''),
-                'directory': domain,
-                'profile_url': 'No results found',
-                'comparisons': {},
-                'scraped_address': '',
-                'scraped_specialty': '',
-                'has_photo': False,
-                'overall_score': 0.0,
-                'error': 'No search results found'
-            })
-            continue
-        
-        # Scrape each URL found
-        scraper = ScraperFactory.get_scraper(domain)
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    while True:
+        for last_seq, doctor, domain, rows, error in queue.finished_jobs(audit_id, after=last_seq):
+            key = doctor_key(doctor)
+            record = records.get(key)
+            if record is None:
+                record = records[key] = RosterRecord(doctor['Name'], doctor['Location'], doctor['Website'])
+            
+            if error and not rows:
+                # A job that used up its attempts still gets a row, so the gap shows in the results
+                results = [build_error_result(record, domain, '', error)]
+            else:
+                results = [ComparisonResult.from_dict(row, record) for row in rows]
+            all_results.extend(results)
+            live.add(results)
         
-        for url in urls:
-            try:
-                logger.info(f"Scraping {url}")
-                scraped_data = scraper.extract_profile_data(url)
-                
-                # Compare with original data
-                comparison_result = comparator.compare_profiles(doctor_data, scraped_data)
-                
-                profile_results.append(comparison_result)
-                
-            except Exception as e:
-                logger.error(f"Error processing {url}: {str(e)}")
-                profile_results.append({
-                    'doctor_name': doctor_name,
-                    'original_location': location,
-                    'original_website': doctor_data.get('Website', ''),
-                    'directory': domain,
-                    'profile_url': url,
-                    'comparisons': {},
-                    'scraped_address': '',
-                    'scraped_specialty': '',
-                    'has_photo': False,
-                    'overall_score': 0.0,
-                    'error': str(e)
-                })
+        progress = queue.progress(audit_id)
+        status_text.text(
+            f"{progress['finished']}/{progress['total']} jobs finished, {progress['leased']} running "
+            f"on {progress['workers']} workers, {progress['pending']} waiting"
+        )
+        progress_bar.progress(progress['finished'] / progress['total'] if progress['total'] else 1.0)
+        if live.should_refresh():
+            render_live_results(live_panel, live)
         
-        # Clean up scraper
-        scraper.teardown_driver()
+        if progress['finished'] >= progress['total']:
+            break
+        time.sleep(JOB_POLL_SECONDS)
+    
+    live_panel.empty()
+    progress_bar.empty()
+    status_text.empty()
     
-    return profile_results
+    st.session_state.audit_results = all_results
+    st.session_state.audit_id = audit_id
+    st.session_state.results_view = None
+    st.session_state.processing_complete = True
+    st.session_state.queued_audit = None
 
 def create_results_dataframe(results):
-    """Convert results to a pandas DataFrame for display"""
-    rows = []
-    
-    for result in results:
-        row = {
-            'Doctor Name': result['doctor_name'],
-            'Directory': result['directory'],
-            'Profile URL': result['profile_url'],
-            'Overall Score': f"{result['overall_score']:.2f}",
-            'Scraped Name': result['comparisons'].get('name', {}).get('scraped', ''),
-            'Name Match': result['comparisons'].get('name', {}).get('status', ''),
-            'Scraped Phone': result['comparisons'].get('phone', {}).get('scraped', '') if 'phone' in result['comparisons'] else '',
-            'Phone Match': result['comparisons'].get('phone', {}).get('status', '') if 'phone' in result['comparisons'] else '',
-            'Scraped Website': result['comparisons'].get('website', {}).get('scraped', ''),
-            'Website Match': result['comparisons'].get('website', {}).get('status', ''),
-            'Address': result['scraped_address'],
-            'Specialty': result['scraped_specialty'],
-            'Has Photo': result['has_photo'],
-            'Error': result.get('error', '')
+    """Convert results to an Arrow-backed pandas DataFrame for display"""
+    results_df = pd.DataFrame.from_records((flatten_result(result) for result in results), columns=RESULT_COLUMNS)
+    results_df['Overall Score'] = pd.to_numeric(results_df['Overall Score'])
+    return results_df.convert_dtypes(dtype_backend='pyarrow')
+
+def get_results_view():
+    """
+    Return the current audit's results frame and its directory choices
+    Built once per audit and kept in session state, so widget reruns
+    reuse it instead of rebuilding it from the result dicts.
+    """
+    view = st.session_state.results_view
+    if view is None or view['audit_id'] != st.session_state.audit_id:
+        results_df = create_results_dataframe(st.session_state.audit_results)
+        view = st.session_state.results_view = {
+            'audit_id': st.session_state.audit_id,
+            'frame': results_df,
+            'directories': sorted(results_df['Directory'].dropna().unique())
         }
-        rows.append(row)
+        st.session_state.results_exports = {}
+    return view
+
+def render_results_export():
+    """
+    Offer the full results as CSV, Parquet or Excel
+    Each export is written to disk in chunks on a background thread, only
+    when asked for, and kept for the rest of the audit's session. While it
+    runs the page reruns every EXPORT_POLL_SECONDS to show its progress
+    rather than blocking the script. The finished file is only read on the
+    run where the user asks to download it; exports too large to send
+    through the browser are offered by path instead.
+    """
+    col_format, col_button = st.columns(2)
+    
+    with col_format:
+        export_label = st.selectbox("Export format", list(EXPORT_FORMATS))
+        export_format = EXPORT_FORMATS[export_label]
     
-    return pd.DataFrame(rows)
+    exports = st.session_state.results_exports
+    job = exports.get(export_format)
+    
+    with col_button:
+        if job is None and st.button("Prepare Export"):
+            job = exports[export_format] = ExportJob(
+                st.session_state.audit_results, export_format, f"doctor_audit_results_{st.session_state.audit_id}"
+            ).start()
+    
+    if job is None:
+        return
+    
+    if not job.done():
+        st.progress(
+            job.rows_written / max(1, job.total),
+            text=f"Exported {job.rows_written:,} of {job.total:,} rows"
+        )
+        time.sleep(EXPORT_POLL_SECONDS)
+        st.rerun()
+    
+    if job.error:
+        st.error(f"Export failed: {job.error}")
+        del exports[export_format]
+        return
+    
+    size = os.path.getsize(job.path)
+    if size > EXPORT_DOWNLOAD_MAX_BYTES:
+        st.info(f"The {export_label} export is {size / 2**20:,.0f} MB, too large to download here. It was saved to:")
+        st.code(os.path.abspath(job.path), language=None)
+        return
+    
+    with col_button:
+        requested = st.button(f"Download {export_label} ({size / 2**20:,.1f} MB)")
+    
+    if requested:
+        with open(job.path, 'rb') as f:
+            st.download_button(
+                label=f"Save {os.path.basename(job.path)}",
+                data=f,
+                file_name=os.path.basename(job.path),
+                mime=job.mime_type
+            )
+
+def filter_mask(results_df, column, value):
+    """Boolean mask of rows whose column equals value; "All" matches every row"""
+    if value == "All":
+        return np.ones(len(results_df), dtype=bool)
+    return (results_df[column] == value).to_numpy(dtype=bool, na_value=False)
 
 def main():
     st.set_page_config(
@@ -161,10 +329,54 @@ def main():
         st.subheader("All Domains to Search")
         for domain in all_domains:
             st.text(f"• {domain}")
+        
+        # Parallelism settings
+        st.subheader("Parallelism")
+        doctor_workers = st.number_input(
+            "Doctors processed in parallel",
+            min_value=1,
+            max_value=64,
+            value=MAX_DOCTOR_WORKERS,
+            help="Number of doctors searched and scraped concurrently"
+        )
+        scrape_workers = st.number_input(
+            "Concurrent profile scrapes",
+            min_value=1,
+            max_value=64,
+            value=MAX_SCRAPE_WORKERS,
+            help="Number of (directory, URL) pages fetched concurrently across all doctors"
+        )
+        
+        resume_audits = st.checkbox(
+            "Resume interrupted audits",
+            value=True,
+            help="Re-running the same CSV with the same directories skips work already completed"
+        )
+        
+        use_workers = st.checkbox(
+            "Run on background workers",
+            value=False,
+            help="Queue the audit for worker.py processes instead of running it here; start them with `python worker.py`"
+        )
+        
+        # Per-host windows grow on success and shrink on timeouts, 429s and CAPTCHAs
+        st.subheader("Domain Concurrency")
+        concurrency_panel = st.empty()
+        render_concurrency_windows(concurrency_panel)
+        
+        # Per-stage timing spans, tagged by domain and doctor
+        st.subheader("Stage Timings")
+        timings_panel = st.empty()
+        render_stage_timings(timings_panel)
     
     # Main content area
     col1, col2 = st.columns([1, 2])
     
+    # Rows stream into this panel while an audit is running
+    with col2:
+        st.header("Audit Results")
+        live_panel = st.empty()
+    
     with col1:
         st.header("Upload CSV File")
         
@@ -184,7 +396,14 @@ def main():
                     st.dataframe(df.head())
                     
                     # Process button
-                    if st.button("Start Audit", type="primary"):
+                    start_audit = st.button("Start Audit", type="primary")
+                    if start_audit and use_workers:
+                        # Workers do the processing; the poll below follows it, across reruns
+                        st.session_state.queued_audit = submit_queued_audit(
+                            df, uploaded_file.getvalue(), all_domains, resume_audits
+                        )
+                        st.session_state.processing_complete = False
+                    elif start_audit:
                         if len(df) > 10:
                             st.warning("Processing more than 10 doctors may take a while. Consider testing with a smaller sample first.")
                         
@@ -193,38 +412,109 @@ def main():
                             search_engine = SearchEngine(max_results=MAX_SEARCH_RESULTS)
                             comparator = ProfileComparator()
                             
+                            # The same roster and domain set resume from their checkpoint journal
+                            audit_id = compute_audit_id(digest_roster(uploaded_file.getvalue()), all_domains)
+                            journal = CheckpointJournal(audit_id)
+                            if not resume_audits:
+                                journal.reset()
+                            elif journal.completed_count():
+                                st.info(f"Resuming audit {audit_id}: {journal.completed_count()} results already completed")
+                            
+                            # Timings cover this run only
+                            get_metrics().reset()
+                            
+                            # Profiles found for several doctors are scraped once per audit
+                            scrapes = SingleFlightScrapes()
+                            
                             all_results = []
+                            live = LiveAuditResults()
                             progress_bar = st.progress(0)
                             status_text = st.empty()
                             
-                            # Process each doctor
-                            for idx, (_, doctor_data) in enumerate(df.iterrows()):
-                                status_text.text(f"Processing {doctor_data['Name']} ({idx + 1}/{len(df)})")
-                                
-                                try:
-                                    doctor_results = process_doctor_profile(
-                                        doctor_data, all_domains, search_engine, comparator
-                                    )
-                                    all_results.extend(doctor_results)
-                                except Exception as e:
-                                    logger.error(f"Error processing {doctor_data['Name']}: {str(e)}")
-                                    st.error(f"Error processing {doctor_data['Name']}: {str(e)}")
+                            # Doctors and their (domain, url) scrapes run on separate pools so
+                            # doctor tasks waiting on scrapes can never starve the scrape pool
+                            with ThreadPoolExecutor(max_workers=doctor_workers) as doctor_executor, \
+                                    ThreadPoolExecutor(max_workers=scrape_workers) as scrape_executor:
+                                futures = {
+                                    doctor_executor.submit(
+                                        process_doctor_profile,
+                                        doctor_data, all_domains, search_engine, comparator, scrape_executor, journal, scrapes
+                                    ): doctor_data['Name']
+                                    for _, doctor_data in df.iterrows()
+                                }
                                 
-                                # Update progress
-                                progress_bar.progress((idx + 1) / len(df))
+                                # Update progress from the completion stream
+                                for completed, future in enumerate(as_completed(futures), start=1):
+                                    doctor_name = futures[future]
+                                    try:
+                                        doctor_results = future.result()
+                                        all_results.extend(doctor_results)
+                                        live.add(doctor_results)
+                                    except Exception as e:
+                                        live.add_failure()
+                                        logger.error(f"Error processing {doctor_name}: {str(e)}")
+                                        st.error(f"Error processing {doctor_name}: {str(e)}")
+                                    
+                                    status_text.text(f"Finished {doctor_name} ({completed}/{len(df)})")
+                                    progress_bar.progress(completed / len(df))
+                                    if live.should_refresh():
+                                        render_live_results(live_panel, live)
+                                        render_concurrency_windows(concurrency_panel)
+                                        render_stage_timings(timings_panel)
+                            
+                            journal.close()
+                            
+                            # The full results view below replaces the live panel
+                            live_panel.empty()
+                            render_concurrency_windows(concurrency_panel)
+                            render_stage_timings(timings_panel)
                             
                             st.session_state.audit_results = all_results
+                            st.session_state.audit_id = audit_id
+                            st.session_state.results_view = None
                             st.session_state.processing_complete = True
                             status_text.text("Processing complete!")
                             
+                            # Report how often each directory needed the browser
+                            escalation_report = get_http_fetcher().stats.report()
+                            for domain, counts in escalation_report.items():
+                                logger.info(
+                                    f"{domain}: {counts['http']} via HTTP, {counts['browser']} escalated to browser "
+                                    f"({counts['escalation_rate']:.0%}) {counts['reasons']}"
+                                )
+                            st.session_state.escalation_report = escalation_report
+                            
+                            page_load_report = get_page_load_stats().report()
+                            for domain, counts in page_load_report.items():
+                                logger.info(
+                                    f"{domain}: {counts['pages']} browser pages, {counts['avg_kb']:.0f} KB and "
+                                    f"{counts['avg_load_seconds']:.2f}s per page"
+                                )
+                            st.session_state.page_load_report = page_load_report
+                            
+                            scrape_stats = scrapes.stats()
+                            logger.info(
+                                f"Profile scrapes: {scrape_stats['fetches']} fetched, "
+                                f"{scrape_stats['reused'] + scrape_stats['joined']} shared with other rows"
+                            )
+                            
+                            if search_engine.cache is not None:
+                                cache_stats = search_engine.cache.stats()
+                                logger.info(
+                                    f"Search cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                                    f"({cache_stats['hit_rate']:.0%} hit rate)"
+                                )
+            
             except Exception as e:
                 st.error(f"Error reading CSV file: {str(e)}")
     
     with col2:
-        st.header("Audit Results")
+        if st.session_state.queued_audit:
+            follow_queued_audit(st.session_state.queued_audit, live_panel)
         
         if st.session_state.processing_complete and st.session_state.audit_results:
-            results_df = create_results_dataframe(st.session_state.audit_results)
+            view = get_results_view()
+            results_df = view['frame']
             
             # Display summary metrics
             col2a, col2b, col2c = st.columns(3)
@@ -234,13 +524,64 @@ def main():
                 st.metric("Total Profiles Found", total_profiles)
             
             with col2b:
-                matches = len(results_df[results_df['Name Match'] == 'Match'])
+                matches = int(filter_mask(results_df, 'Name Match', 'Match').sum())
                 st.metric("Name Matches", matches)
             
             with col2c:
-                avg_score = results_df['Overall Score'].astype(float).mean()
+                avg_score = results_df['Overall Score'].mean()
                 st.metric("Average Match Score", f"{avg_score:.2f}")
             
+            if st.session_state.escalation_report:
+                with st.expander("Fetch tier by directory"):
+                    st.dataframe(
+                        pd.DataFrame([
+                            {
+                                'Directory': domain,
+                                'HTTP': counts['http'],
+                                'Browser': counts['browser'],
+                                'Escalation Rate': f"{counts['escalation_rate']:.0%}"
+                            }
+                            for domain, counts in st.session_state.escalation_report.items()
+                        ]),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+            
+            if st.session_state.page_load_report:
+                with st.expander("Browser page weight by directory"):
+                    st.dataframe(
+                        pd.DataFrame([
+                            {
+                                'Directory': domain,
+                                'Pages': counts['pages'],
+                                'Avg KB': round(counts['avg_kb'], 1),
+                                'Avg Resources': round(counts['avg_resources'], 1),
+                                'Avg Load (s)': round(counts['avg_load_seconds'], 2)
+                            }
+                            for domain, counts in st.session_state.page_load_report.items()
+                        ]),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+            
+            with st.expander("Stage timing export"):
+                metrics = get_metrics()
+                col_json, col_prom = st.columns(2)
+                with col_json:
+                    st.download_button(
+                        label="📈 Metrics (JSON)",
+                        data=metrics.to_json(),
+                        file_name="audit_metrics.json",
+                        mime="application/json"
+                    )
+                with col_prom:
+                    st.download_button(
+                        label="📈 Metrics (Prometheus)",
+                        data=metrics.to_prometheus(),
+                        file_name="audit_metrics.prom",
+                        mime="text/plain"
+                    )
+            
             # Display results table
             st.subheader("Detailed Results")
             
@@ -250,7 +591,7 @@ def main():
             with col_filter1:
                 directory_filter = st.selectbox(
                     "Filter by Directory",
-                    ["All"] + list(results_df['Directory'].unique())
+                    ["All"] + view['directories']
                 )
             
             with col_filter2:
@@ -259,33 +600,35 @@ def main():
                     ["All", "Match", "Mismatch", "Missing"]
                 )
             
-            # Apply filters
-            filtered_df = results_df.copy()
+            # Apply filters as masks; only the rows on the current page are copied
+            mask = filter_mask(results_df, 'Directory', directory_filter)
+            mask &= filter_mask(results_df, 'Name Match', match_filter)
+            matching_rows = np.flatnonzero(mask)
+            
+            col_page1, col_page2 = st.columns(2)
             
-            if directory_filter != "All":
-                filtered_df = filtered_df[filtered_df['Directory'] == directory_filter]
+            with col_page1:
+                page_size = st.selectbox("Rows per page", RESULTS_PAGE_SIZES)
             
-            if match_filter != "All":
-                filtered_df = filtered_df[filtered_df['Name Match'] == match_filter]
+            page_count = max(1, -(-len(matching_rows) // page_size))
+            with col_page2:
+                page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
             
-            # Display filtered results
+            page_start = (page - 1) * page_size
+            st.caption(
+                f"Showing {min(page_start + 1, len(matching_rows))}-{min(page_start + page_size, len(matching_rows))} "
+                f"of {len(matching_rows)} matching rows"
+            )
+            
+            # Display the current page of filtered results
             st.dataframe(
-                filtered_df,
+                results_df.iloc[matching_rows[page_start:page_start + page_size]],
                 use_container_width=True,
                 hide_index=True
             )
             
-            # Download button
-            csv_buffer = StringIO()
-            results_df.to_csv(csv_buffer, index=False)
-            
-            st.download_button(
-                label="Download Full Results as CSV",
-                data=csv_buffer.getvalue(),
-                file_name=f"doctor_audit_results_{int(time.time())}.csv",
-                mime="text/csv"
-            )
-            
+            render_results_export()
+        
         elif st.session_state.processing_complete:
             st.info("No results to display. Upload a CSV file and click 'Start Audit' to begin.")
         else:
@@ -1,45 +1,125 @@
 from abc import ABC, abstractmethod
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+from contextlib import ExitStack
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from cssselect import HTMLTranslator
+from lxml import etree
+import inspect
+import threading
 import time
 import logging
 
+from .driver_pool import get_driver_pool
+from .load_timeout import get_adaptive_timeout
+from .http_fetcher import get_http_fetcher, HttpFetchError
+from .structured_data import extract_structured_profile
+from .resource_blocking import get_resource_blocker, get_page_load_stats, measure_transfer
+from utils.rate_limiter import get_rate_limiter
+from utils.concurrency import get_scheduler, Throttled, looks_blocked
+from utils.metrics import get_metrics
+from utils.page_archive import get_page_archive
+from config import ARCHIVE_MODE, PROFILE_FIELDS
+
+_translator = HTMLTranslator()
+_plan_lock = threading.Lock()
+# Text a visitor would see: inline scripts, styles and noscript blocks hold
+# numbers (tracking ids, JSON blobs) that regex fallbacks would misread
+_VISIBLE_TEXT = etree.XPath('//body//text()[not(ancestor::script or ancestor::style or ancestor::noscript)]')
+
+def compile_selectors(field_selectors):
+    """Compile field -> CSS selector cascades into lxml XPath evaluators"""
+    return {
+        field: [etree.XPath(_translator.css_to_xpath(selector)) for selector in selectors]
+        for field, selectors in field_selectors.items()
+    }
+
 class BaseScraper(ABC):
     """Base class for all medical directory scrapers"""
     
-    def __init__(self, timeout=10):
+    # Element whose presence means the profile is ready to scrape, e.g.
+    # (By.CSS_SELECTOR, 'h1'). None means "DOM ready" is good enough.
+    ready_locator = None
+    
+    # Set when profiles on this domain are rendered client-side, so the
+    # plain HTTP tier is skipped and every fetch goes straight to Selenium
+    needs_javascript = False
+    
+    # Fields the HTTP tier must extract before its result is trusted
+    required_fields = ('name',)
+    
+    # Declarative extraction: field -> ordered CSS selector cascade. The
+    # first selector whose first match yields a value accepted by
+    # clean_field() wins. Fields listed in field_attributes read that
+    # attribute instead of the element text. Both fetch tiers resolve the
+    # whole declaration from one parsed document, so a browser fetch costs
+    # a single page_source round trip instead of one per selector.
+    field_selectors = {}
+    field_attributes = {}
+    
+    # Prefer schema.org JSON-LD/microdata over selectors when the page has it
+    use_structured_data = True
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A scraper with no way to extract a profile fails when it's defined, not on its first page
+        declares_fields = bool(cls.field_selectors) or any(
+            inspect.getattr_static(cls, name) is not inspect.getattr_static(BaseScraper, name)
+            for name in ('scrape_profile', 'get_selector_plan')
+        )
+        if not declares_fields:
+            raise TypeError(f"{cls.__name__} declares no field_selectors and doesn't override scrape_profile")
+    
+    def __init__(self, timeout=10, driver_pool=None, http_fetcher=None, rate_limiter=None,
+                 archive=None, archive_mode=ARCHIVE_MODE, scheduler=None):
         self.timeout = timeout
         self.driver = None
+        self.driver_pool = driver_pool
+        self.http_fetcher = http_fetcher
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.scheduler = scheduler or get_scheduler()
+        self.archive = archive
+        self.archive_mode = archive_mode
+        self.page_source = None
+        self.round_trips = 0
         self.logger = logging.getLogger(self.__class__.__name__)
     
-    def setup_driver(self):
-        """Initialize Chrome WebDriver with appropriate options"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.set_page_load_timeout(self.timeout)
-        
-    def teardown_driver(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+    def get_driver_pool(self):
+        """Return the pool this scraper checks browsers out from"""
+        if self.driver_pool is None:
+            self.driver_pool = get_driver_pool()
+        return self.driver_pool
+    
+    def get_http_fetcher(self):
+        """Return the fetcher used for the plain HTTP tier"""
+        if self.http_fetcher is None:
+            self.http_fetcher = get_http_fetcher()
+        return self.http_fetcher
+    
+    def get_archive(self):
+        """Return the page archive used in record and replay modes"""
+        if self.archive is None:
+            self.archive = get_page_archive()
+        return self.archive
+    
+    def archive_page(self, url, page_source, tier):
+        """Store a fetched page when recording is enabled"""
+        if self.archive_mode != 'record':
+            return
+        try:
+            self.get_archive().store(url, page_source, self.get_domain(), tier)
+        except Exception as e:
+            # Archiving is best effort and must never fail a scrape
+            self.logger.warning(f"Failed to archive {url}: {str(e)}")
+    
+    def empty_profile(self):
+        """Return a profile dict with every field blank"""
+        return {field: False if field == 'has_photo' else '' for field in PROFILE_FIELDS}
     
     def safe_find_element(self, by, value, default=""):
         """Safely find an element and return its text or default value"""
+        self.round_trips += 1
         try:
             element = self.driver.find_element(by, value)
             return element.text.strip()
@@ -48,6 +128,7 @@ class BaseScraper(ABC):
     
     def safe_find_attribute(self, by, value, attribute, default=""):
         """Safely find an element and return its attribute or default value"""
+        self.round_trips += 1
         try:
             element = self.driver.find_element(by, value)
             return element.get_attribute(attribute) or default
@@ -65,44 +146,267 @@ class BaseScraper(ABC):
         except TimeoutException:
             return None
     
-    @abstractmethod
+    def is_ready(self, driver):
+        """Readiness condition polled after navigation; override for custom checks"""
+        self.round_trips += 1
+        if self.ready_locator is not None:
+            return EC.presence_of_element_located(self.ready_locator)(driver)
+        return driver.execute_script("return document.readyState") != "loading"
+    
+    def wait_until_ready(self, started):
+        """Wait for the readiness condition and feed the load time back to the domain's timeout"""
+        timeouts = get_adaptive_timeout()
+        domain = self.get_domain()
+        timeout = timeouts.get_timeout(domain)
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(self.is_ready)
+            timeouts.observe(domain, time.monotonic() - started)
+            return True
+        except TimeoutException:
+            # Scrape whatever rendered; the next wait on this domain gets more room
+            self.logger.warning(f"Page on {domain} not ready after {timeout:.1f}s, scraping anyway")
+            timeouts.observe_timeout(domain)
+            return False
+    
     def scrape_profile(self, url):
         """
         Scrape a doctor's profile from the given URL
         Returns dict with keys: name, phone, address, website, specialty, has_photo
+        By default the rendered page source (already fetched by
+        fetch_with_browser) is parsed with parse_html; subclasses that need
+        live element access can override this and use self.driver
         """
-        pass
+        return self.parse_html(self.get_http_fetcher().parse(self.page_source, url), url)
     
     @abstractmethod
     def get_domain(self):
         """Return the domain name this scraper handles"""
         pass
     
+    def clean_field(self, field, value):
+        """Post-process a candidate value; return a falsy value to fall through to the next selector"""
+        if field == 'has_photo':
+            return bool(value)
+        return ' '.join(value.split())
+    
+    def complete_profile(self, profile_data, tree):
+        """Hook for fallbacks that need the whole document, e.g. regex scans for missing fields"""
+        return profile_data
+    
+    def visible_text(self, tree):
+        """Return the page's body text without script, style or noscript contents, for regex fallbacks"""
+        return ''.join(_VISIBLE_TEXT(tree))
+    
+    @classmethod
+    def get_selector_plan(cls):
+        """Return field_selectors compiled to XPath, compiling once per class"""
+        plan = cls.__dict__.get('_selector_plan')
+        if plan is None:
+            with _plan_lock:
+                plan = cls.__dict__.get('_selector_plan')
+                if plan is None:
+                    plan = compile_selectors(cls.field_selectors)
+                    cls._selector_plan = plan
+        return plan
+    
+    def resolve_fields(self, tree, profile_data=None):
+        """
+        Resolve declared selector cascades against one parsed document
+        Fields already filled in profile_data are skipped. A cascade that
+        raises leaves only its own field blank.
+        """
+        if profile_data is None:
+            profile_data = self.empty_profile()
+        
+        for field, selectors in self.get_selector_plan().items():
+            if profile_data.get(field):
+                continue
+            try:
+                value = self.resolve_field(tree, field, selectors)
+            except Exception as e:
+                self.logger.warning(f"Selectors for {field} failed on {self.get_domain()}: {str(e)}")
+                continue
+            if value:
+                profile_data[field] = value
+        
+        return profile_data
+    
+    def resolve_field(self, tree, field, selectors):
+        """Return the first value one field's selector cascade yields, or None"""
+        attribute = self.field_attributes.get(field)
+        for selector in selectors:
+            elements = selector(tree)
+            if not elements:
+                continue
+            
+            if attribute:
+                raw = elements[0].get(attribute) or ''
+            else:
+                raw = elements[0].text_content()
+            
+            value = self.clean_field(field, raw)
+            if value:
+                return value
+        return None
+    
+    def parse_html(self, tree, url):
+        """
+        Extract profile data from HTML parsed with lxml
+        Returns the same dict as scrape_profile, or None if this scraper
+        has no HTML support (every fetch then escalates to the browser).
+        Errors outside a single field's selectors propagate, so they end up
+        on the result row instead of passing for a blank profile.
+        """
+        if not self.field_selectors:
+            return None
+        
+        with get_metrics().span('parse', domain=self.get_domain()):
+            profile_data = self.empty_profile()
+            if self.use_structured_data:
+                profile_data.update(extract_structured_profile(tree, url))
+            profile_data = self.resolve_fields(tree, profile_data)
+            return self.complete_profile(profile_data, tree)
+    
+    def missing_fields(self, profile_data):
+        """Return the required fields the HTTP tier failed to extract"""
+        return [field for field in self.required_fields if not profile_data.get(field)]
+    
+    def fetch_with_http(self, url):
+        """
+        Try the plain HTTP tier
+        Returns (profile_data, None) on success or (None, reason) when the
+        page has to be escalated to the browser
+        """
+        fetcher = self.get_http_fetcher()
+        self.rate_limiter.acquire(url)
+        try:
+            with self.scheduler.slot(self.get_domain()), get_metrics().span('http_fetch', domain=self.get_domain()):
+                page_source = fetcher.fetch(url, self.get_domain())
+        except HttpFetchError as e:
+            return None, f"http error: {str(e)}"
+        
+        self.archive_page(url, page_source, 'http')
+        try:
+            tree = fetcher.parse(page_source, url)
+        except (ValueError, etree.ParserError) as e:
+            # An empty or unparseable body may still render in a browser
+            return None, f"unparseable html: {str(e) or type(e).__name__}"
+        profile_data = self.parse_html(tree, url)
+        if profile_data is None:
+            return None, "no html parser"
+        
+        missing = self.missing_fields(profile_data)
+        if missing:
+            return None, f"missing {', '.join(missing)}"
+        
+        return profile_data, None
+    
+    def fetch_with_browser(self, url):
+        """Load the page in a pooled browser and scrape it"""
+        # Wait for the domain's token and a slot in its concurrency window
+        # before borrowing a browser, as the HTTP tier does, so pooled drivers
+        # never sit idle while this thread waits on one domain's limits
+        self.rate_limiter.acquire(url)
+        with ExitStack() as window_slot:
+            lease = window_slot.enter_context(self.scheduler.slot(self.get_domain()))
+            
+            # Browsers are borrowed from the shared pool for the duration of one profile
+            with self.get_driver_pool().driver() as driver:
+                self.driver = driver
+                self.round_trips = get_resource_blocker().apply(driver, self.get_domain())
+                try:
+                    # Driver checkout and startup aren't the directory's latency
+                    lease.restart_clock()
+                    started = time.monotonic()
+                    try:
+                        self.driver.get(url)
+                    except TimeoutException:
+                        raise Throttled("page load timeout")
+                    self.round_trips += 1
+                    self.wait_until_ready(started)
+                    load_seconds = time.monotonic() - started
+                    get_metrics().observe('page_load', load_seconds, domain=self.get_domain())
+                    
+                    # One round trip fetches the rendered document for extraction and archiving
+                    self.page_source = self.driver.page_source
+                    self.round_trips += 1
+                    if looks_blocked(self.page_source):
+                        raise Throttled("captcha page")
+                    
+                    # The window slot covers the page load only
+                    window_slot.close()
+                    self.archive_page(url, self.page_source, 'browser')
+                    
+                    transferred_bytes, resources = measure_transfer(self.driver)
+                    self.round_trips += 1
+                    get_page_load_stats().record(self.get_domain(), transferred_bytes, load_seconds, resources)
+                    
+                    profile_data = self.scrape_profile(url)
+                    self.logger.info(
+                        f"Scraped {url} in {self.round_trips} WebDriver round trips, "
+                        f"{load_seconds:.2f}s, {transferred_bytes / 1024:.0f} KB over {resources} resources"
+                    )
+                    return profile_data
+                finally:
+                    self.driver = None
+                    self.page_source = None
+    
+    def fetch_from_archive(self, url):
+        """Re-parse the latest archived copy of a page without touching the network"""
+        page_source = self.get_archive().load_latest(url)
+        if page_source is None:
+            raise LookupError(f"{url} is not in the page archive")
+        
+        # Archived browser pages are rendered HTML, so the lxml parser handles both tiers
+        profile_data = self.parse_html(self.get_http_fetcher().parse(page_source, url), url)
+        if profile_data is None:
+            raise LookupError(f"{self.__class__.__name__} can't parse archived HTML")
+        return profile_data
+    
+    def fetch_profile(self, url):
+        """
+        Run the fetch tiers once for a URL
+        Raises Throttled when the directory pushes back, so the caller can
+        retry after a backoff
+        """
+        profile_data = None
+        stats = self.get_http_fetcher().stats
+        
+        if self.archive_mode == 'replay':
+            profile_data = self.fetch_from_archive(url)
+        elif self.needs_javascript:
+            stats.record_escalation(self.get_domain(), "needs javascript")
+        else:
+            profile_data, reason = self.fetch_with_http(url)
+            if profile_data is not None:
+                stats.record_http(self.get_domain())
+            else:
+                self.logger.info(f"Escalating {url} to browser: {reason}")
+                stats.record_escalation(self.get_domain(), reason)
+        
+        if profile_data is None:
+            profile_data = self.fetch_with_browser(url)
+        
+        return profile_data
+    
     def extract_profile_data(self, url):
         """Main method to extract profile data from a URL"""
         try:
-            if not self.driver:
-                self.setup_driver()
+            # Throttled fetches are retried with jittered backoff while the
+            # domain's concurrency window shrinks
+            profile_data = self.scheduler.call(self.get_domain(), self.fetch_profile, url)
             
-            self.driver.get(url)
-            time.sleep(2)  # Allow page to load
-            
-            profile_data = self.scrape_profile(url)
             profile_data['profile_url'] = url
             profile_data['directory'] = self.get_domain()
             
             return profile_data
-            
+        
         except Exception as e:
             self.logger.error(f"Error scraping {url}: {str(e)}")
-            return {
-                'name': '',
-                'phone': '',
-                'address': '',
-                'website': '',
-                'specialty': '',
-                'has_photo': False,
+            profile_data = self.empty_profile()
+            profile_data.update({
                 'profile_url': url,
                 'directory': self.get_domain(),
                 'error': str(e)
-            }
\ No newline at end of file
+            })
+            return profile_data
\ No newline at end of file
@@ -0,0 +1,191 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+import atexit
+import threading
+import time
+import logging
+
+from utils.metrics import get_metrics
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_USES, PAGE_LOAD_TIMEOUT, PAGE_LOAD_STRATEGY
+
+class DriverPoolExhausted(Exception):
+    """Raised when no driver could be checked out before the timeout"""
+    pass
+
+class DriverPool:
+    """Pool of warm headless Chrome drivers shared by all scrapers"""
+    
+    def __init__(self, size=DRIVER_POOL_SIZE, page_load_timeout=PAGE_LOAD_TIMEOUT, max_uses=DRIVER_MAX_USES,
+                 page_load_strategy=PAGE_LOAD_STRATEGY):
+        self.size = size
+        self.page_load_timeout = page_load_timeout
+        self.page_load_strategy = page_load_strategy
+        self.max_uses = max_uses
+        self.logger = logging.getLogger(__name__)
+        
+        # One condition guards the idle stack and the live-driver count, so a
+        # waiter woken by a discard can start a replacement instead of waiting on
+        # an idle driver that will never come back
+        self._cond = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._uses = {}
+        self._service = None
+        self._closed = False
+    
+    def _build_options(self):
+        """Build the Chrome options shared by every pooled driver"""
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        chrome_options.page_load_strategy = self.page_load_strategy
+        return chrome_options
+    
+    def _create_driver(self):
+        """Start a new Chrome instance"""
+        if self._service is None:
+            # Resolve the chromedriver binary once instead of on every start
+            self._service = Service(ChromeDriverManager().install())
+        
+        with get_metrics().span('driver_start'):
+            driver = webdriver.Chrome(service=self._service, options=self._build_options())
+        driver.set_page_load_timeout(self.page_load_timeout)
+        self.logger.info("Started pooled Chrome driver")
+        return driver
+    
+    def _is_healthy(self, driver):
+        """Check that the browser session still responds"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+    
+    def _reset(self, driver):
+        """Clear cookies and storage so checkouts don't leak state into each other"""
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.get("about:blank")
+            return True
+        except WebDriverException as e:
+            self.logger.warning(f"Failed to reset pooled driver: {str(e)}")
+            return False
+    
+    def _discard(self, driver):
+        """Quit a driver and free its slot in the pool"""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting pooled driver: {str(e)}")
+        with self._cond:
+            self._created -= 1
+            self._uses.pop(id(driver), None)
+            self._cond.notify()
+    
+    def acquire(self, timeout=None):
+        """Check out a healthy driver, starting one if the pool has room"""
+        with get_metrics().span('driver_checkout'):
+            return self._acquire(timeout)
+    
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self._cond:
+                # Recheck both "take an idle driver" and "start a new one" after every wake-up
+                while not self._closed and not self._idle and self._created >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolExhausted(f"No driver available after {timeout}s")
+                    self._cond.wait(remaining)
+                
+                if self._closed:
+                    raise DriverPoolExhausted("Driver pool is closed")
+                
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+            
+            if driver is None:
+                try:
+                    driver = self._create_driver()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+            
+            if self._is_healthy(driver):
+                with self._cond:
+                    self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                return driver
+            
+            self.logger.warning("Discarding unresponsive pooled driver")
+            self._discard(driver)
+    
+    def release(self, driver, discard=False):
+        """Return a driver to the pool, recycling it if it is broken or worn out"""
+        if driver is None:
+            return
+        
+        with self._cond:
+            worn_out = self.max_uses and self._uses.get(id(driver), 0) >= self.max_uses
+        if self._closed or discard or worn_out or not self._reset(driver):
+            self._discard(driver)
+            return
+        
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        self._discard(driver)
+    
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager that checks a driver out and always returns it"""
+        driver = self.acquire(timeout=timeout)
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            # The session may be wedged; let the health check decide on return
+            discard = not self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, discard=discard)
+    
+    def close(self):
+        """Quit every idle driver and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiters recheck _closed and give up instead of sleeping out their timeout
+            self._cond.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
@@ -0,0 +1,149 @@
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+import threading
+import logging
+
+from config import HTTP_TIMEOUT, HTTP_POOL_MAXSIZE, HTTP_PROXIES
+from utils.concurrency import Throttled, looks_blocked, parse_retry_after
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+UTF8_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+class HttpFetchError(Exception):
+    """Raised when a plain HTTP fetch can't produce a usable HTML page"""
+    pass
+
+class EscalationStats:
+    """Per-domain counts of pages served over HTTP versus escalated to the browser"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+    
+    def _entry(self, domain):
+        return self._counts.setdefault(domain, {'http': 0, 'browser': 0, 'reasons': {}})
+    
+    def record_http(self, domain):
+        """Record a profile fully extracted from the HTTP tier"""
+        with self._lock:
+            self._entry(domain)['http'] += 1
+    
+    def record_escalation(self, domain, reason):
+        """Record a profile that had to fall back to Selenium"""
+        with self._lock:
+            entry = self._entry(domain)
+            entry['browser'] += 1
+            entry['reasons'][reason] = entry['reasons'].get(reason, 0) + 1
+    
+    def report(self):
+        """Return per-domain counts and escalation rates"""
+        with self._lock:
+            report = {}
+            for domain, entry in self._counts.items():
+                total = entry['http'] + entry['browser']
+                report[domain] = {
+                    'http': entry['http'],
+                    'browser': entry['browser'],
+                    'escalation_rate': entry['browser'] / total if total else 0.0,
+                    'reasons': dict(entry['reasons'])
+                }
+            return report
+
+class HttpFetcher:
+    """Fetch pages over pooled keep-alive sessions, one session per domain"""
+    
+    def __init__(self, timeout=HTTP_TIMEOUT, pool_maxsize=HTTP_POOL_MAXSIZE, proxies=HTTP_PROXIES):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.proxies = proxies
+        self.stats = EscalationStats()
+        self.logger = logging.getLogger(__name__)
+        
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    def get_session(self, domain):
+        """Return the pooled session for a domain, creating it on first use"""
+        with self._lock:
+            session = self._sessions.get(domain)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                if self.proxies:
+                    session.proxies.update(self.proxies)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[domain] = session
+            return session
+    
+    def fetch(self, url, domain):
+        """GET a page and return its raw HTML bytes; raises Throttled when the host pushes back"""
+        try:
+            response = self.get_session(domain).get(url, timeout=self.timeout)
+        except requests.Timeout as e:
+            raise Throttled(f"timeout: {str(e)}")
+        except requests.RequestException as e:
+            raise HttpFetchError(f"request failed: {str(e)}")
+        
+        # Overload signals are raised as Throttled so the scheduler backs off
+        # instead of escalating to a browser that would be refused too
+        if response.status_code in (429, 503):
+            raise Throttled(f"status {response.status_code}", parse_retry_after(response.headers.get('Retry-After')))
+        if looks_blocked(response.text):
+            raise Throttled("captcha page")
+        
+        if response.status_code != 200:
+            raise HttpFetchError(f"status {response.status_code}")
+        
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type.lower():
+            raise HttpFetchError(f"unexpected content type {content_type!r}")
+        
+        # lxml reads the page's own <meta charset> or XML declaration from the
+        # bytes; decoded text carrying an encoding declaration is rejected outright
+        return response.content
+    
+    def parse(self, page_source, url=None):
+        """
+        Parse HTML into an lxml tree
+        Raises ValueError or etree.ParserError for pages lxml can't parse,
+        such as an empty body.
+        """
+        if isinstance(page_source, str):
+            # Already-decoded text, e.g. a browser's page_source: ignore any declared encoding
+            return lxml_html.fromstring(page_source.encode('utf-8'), base_url=url, parser=UTF8_PARSER)
+        return lxml_html.fromstring(page_source, base_url=url)
+    
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+_shared_fetcher = None
+_shared_fetcher_lock = threading.Lock()
+
+def get_http_fetcher():
+    """Return the process-wide HTTP fetcher, creating it on first use"""
+    global _shared_fetcher
+    with _shared_fetcher_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = HttpFetcher()
+        return _shared_fetcher
+
+def set_http_fetcher(fetcher):
+    """Replace the process-wide HTTP fetcher, e.g. with one routed through a proxy; returns the previous one"""
+    global _shared_fetcher
+    with _shared_fetcher_lock:
+        previous, _shared_fetcher = _shared_fetcher, fetcher
+        return previous
@@ -0,0 +1,61 @@
+import threading
+
+from config import WEBDRIVER_TIMEOUT, READINESS_MIN_TIMEOUT
+
+class AdaptiveTimeout:
+    """
+    Per-domain readiness timeout learned from observed page load times.
+
+    Keeps a smoothed load time and its mean deviation for each domain (the
+    same estimator TCP uses for retransmission timeouts) and allows
+    smoothed + 4 * deviation, clamped between the configured bounds.
+    """
+    
+    def __init__(self, initial=WEBDRIVER_TIMEOUT, minimum=READINESS_MIN_TIMEOUT, maximum=WEBDRIVER_TIMEOUT,
+                 alpha=0.125, beta=0.25):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self.beta = beta
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    def get_timeout(self, domain):
+        """Return the current readiness timeout in seconds for a domain"""
+        with self._lock:
+            stats = self._stats.get(domain)
+        if stats is None:
+            return self.initial
+        
+        smoothed, deviation = stats
+        return min(self.maximum, max(self.minimum, smoothed + 4 * deviation))
+    
+    def observe(self, domain, elapsed):
+        """Record how long a page on this domain took to become ready"""
+        with self._lock:
+            stats = self._stats.get(domain)
+            if stats is None:
+                self._stats[domain] = (elapsed, elapsed / 2)
+                return
+            
+            smoothed, deviation = stats
+            deviation = (1 - self.beta) * deviation + self.beta * abs(smoothed - elapsed)
+            smoothed = (1 - self.alpha) * smoothed + self.alpha * elapsed
+            self._stats[domain] = (smoothed, deviation)
+    
+    def observe_timeout(self, domain):
+        """Record a readiness wait that ran out, so the next one gets more room"""
+        self.observe(domain, self.get_timeout(domain) * 2)
+    
+    def snapshot(self):
+        """Return current timeouts for every observed domain"""
+        with self._lock:
+            domains = list(self._stats)
+        return {domain: self.get_timeout(domain) for domain in domains}
+
+_shared_timeouts = AdaptiveTimeout()
+
+def get_adaptive_timeout():
+    """Return the process-wide adaptive timeout registry"""
+    return _shared_timeouts
@@ -0,0 +1,135 @@
+from selenium.common.exceptions import WebDriverException
+import threading
+import weakref
+import logging
+
+from config import BLOCK_RESOURCES, BLOCKED_RESOURCES, RESOURCE_ALLOWLIST
+
+# Sums what the page itself fetched. Cross-origin entries without
+# Timing-Allow-Origin report 0 bytes, so this is a lower bound.
+_TRANSFER_SCRIPT = """
+var size = function (e) { return e.transferSize || e.encodedBodySize || 0; };
+var total = 0;
+performance.getEntriesByType('navigation').forEach(function (e) { total += size(e); });
+var resources = performance.getEntriesByType('resource');
+resources.forEach(function (e) { total += size(e); });
+return [total, resources.length];
+"""
+
+class ResourceBlocker:
+    """
+    Block page resources that extraction never needs.
+    
+    Images, fonts, media and ad/analytics hosts are blocked at the network
+    layer through the DevTools Network.setBlockedURLs command, applied each
+    time a driver is checked out for a domain. Image elements still carry
+    their src attribute, so has_photo checks are unaffected. Domains listed
+    in the allowlist can let whole categories or single patterns through.
+    """
+    
+    def __init__(self, enabled=BLOCK_RESOURCES, blocked=BLOCKED_RESOURCES, allowlist=RESOURCE_ALLOWLIST):
+        self.enabled = enabled
+        self.blocked = blocked
+        self.allowlist = allowlist
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._patterns = {}
+        # Patterns currently applied to each live driver, so repeat checkouts
+        # for the same domain skip the DevTools round trips
+        self._applied = weakref.WeakKeyDictionary()
+    
+    @staticmethod
+    def _expand(pattern):
+        """Let extension patterns match URLs that carry a query string"""
+        if pattern.startswith('*.'):
+            return [pattern, f"{pattern}?*"]
+        return [pattern]
+    
+    def get_patterns(self, domain):
+        """Return the URL patterns blocked on a domain"""
+        with self._lock:
+            if domain not in self._patterns:
+                allowed = set(self.allowlist.get(domain, ()))
+                patterns = []
+                for category, category_patterns in self.blocked.items():
+                    if category in allowed:
+                        continue
+                    for pattern in category_patterns:
+                        if pattern not in allowed:
+                            patterns.extend(self._expand(pattern))
+                self._patterns[domain] = patterns
+            return self._patterns[domain]
+    
+    def apply(self, driver, domain):
+        """Install the domain's blocking profile on a driver; returns the number of DevTools calls made"""
+        patterns = self.get_patterns(domain) if self.enabled else []
+        if self._applied.get(driver, []) == patterns:
+            return 0
+        
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except (WebDriverException, AttributeError) as e:
+            # Not a Chromium driver, or DevTools is unavailable; load everything
+            self.logger.warning(f"Could not apply resource blocking for {domain}: {str(e)}")
+            return 0
+        
+        self._applied[driver] = patterns
+        return 2
+
+class PageLoadStats:
+    """Per-domain bytes transferred and load time for browser fetches"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._domains = {}
+    
+    def record(self, domain, transferred_bytes, load_seconds, resources):
+        with self._lock:
+            counts = self._domains.setdefault(domain, {'pages': 0, 'bytes': 0, 'seconds': 0.0, 'resources': 0})
+            counts['pages'] += 1
+            counts['bytes'] += transferred_bytes
+            counts['seconds'] += load_seconds
+            counts['resources'] += resources
+    
+    def report(self):
+        """Return average bytes, resources and load time per page for each domain"""
+        with self._lock:
+            return {
+                domain: {
+                    'pages': counts['pages'],
+                    'avg_kb': counts['bytes'] / counts['pages'] / 1024,
+                    'avg_load_seconds': counts['seconds'] / counts['pages'],
+                    'avg_resources': counts['resources'] / counts['pages'],
+                }
+                for domain, counts in self._domains.items()
+            }
+
+def measure_transfer(driver):
+    """Return (bytes transferred, resource count) for the page loaded in a driver"""
+    try:
+        transferred_bytes, resources = driver.execute_script(_TRANSFER_SCRIPT)
+        return int(transferred_bytes or 0), int(resources or 0)
+    except (WebDriverException, TypeError, ValueError):
+        return 0, 0
+
+_shared_blocker = None
+_shared_stats = None
+_shared_lock = threading.Lock()
+
+def get_resource_blocker():
+    """Return the process-wide resource blocker"""
+    global _shared_blocker
+    with _shared_lock:
+        if _shared_blocker is None:
+            _shared_blocker = ResourceBlocker()
+        return _shared_blocker
+
+def get_page_load_stats():
+    """Return the process-wide page load statistics"""
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = PageLoadStats()
+        return _shared_stats
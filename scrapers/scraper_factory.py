@@ -1,34 +1,53 @@
 from .vitals_scraper import VitalsScraper
 from .base_scraper import BaseScraper
+from .spec_scraper import SpecScraper, load_specs
+import re
 
 class ScraperFactory:
     """Factory class to create appropriate scrapers for different domains"""
     
+    # Hand-written scrapers take precedence over specs for the same domain
     _scrapers = {
         'vitals.com': VitalsScraper,
-        # Add more scrapers here as they're implemented
-        # 'webmd.com': WebMDScraper,
-        # 'healthgrades.com': HealthGradesScraper,
     }
     
+    # Declarative specs from scrapers/specs/*.json, compiled once at startup
+    _specs = load_specs()
+    
     @classmethod
     def get_scraper(cls, domain):
         """Get appropriate scraper for a domain"""
         scraper_class = cls._scrapers.get(domain)
         if scraper_class:
             return scraper_class()
-        else:
-            # Return a generic scraper for unsupported domains
-            return GenericScraper(domain)
+        
+        spec = cls._specs.get(domain)
+        if spec:
+            return SpecScraper(spec)
+        
+        # Return a generic scraper for unsupported domains
+        return GenericScraper(domain)
+    
+    @classmethod
+    def register_spec(cls, spec):
+        """Add or replace the spec used for a domain"""
+        cls._specs[spec.domain] = spec
     
     @classmethod
     def get_supported_domains(cls):
         """Get list of supported domains"""
-        return list(cls._scrapers.keys())
+        return list(cls._scrapers.keys()) + [domain for domain in cls._specs if domain not in cls._scrapers]
 
 class GenericScraper(BaseScraper):
     """Generic scraper for unsupported domains - extracts basic info"""
     
+    # The page title is the best generic guess at the doctor's name
+    field_selectors = {
+        'name': ['title']
+    }
+    
+    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    
     def __init__(self, domain):
         super().__init__()
         self.domain = domain
@@ -36,32 +55,11 @@ class GenericScraper(BaseScraper):
     def get_domain(self):
         return self.domain
     
-    def scrape_profile(self, url):
-        """Basic scraping for unsupported domains"""
-        profile_data = {
-            'name': '',
-            'phone': '',
-            'address': '',
-            'website': '',
-            'specialty': '',
-            'has_photo': False
-        }
-        
-        try:
-            # Try to find basic info using common selectors
-            page_title = self.driver.title
-            if page_title:
-                profile_data['name'] = page_title
-            
-            # Look for phone numbers in page text
-            import re
-            page_text = self.driver.page_source
-            phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-            phone_match = re.search(phone_pattern, page_text)
+    def complete_profile(self, profile_data, tree):
+        """Look for phone numbers in page text"""
+        if not profile_data['phone']:
+            phone_match = re.search(self.phone_pattern, self.visible_text(tree))
             if phone_match:
                 profile_data['phone'] = phone_match.group()
-                
-        except Exception as e:
-            self.logger.error(f"Error in generic scraping for {url}: {str(e)}")
         
         return profile_data
\ No newline at end of file
@@ -0,0 +1,136 @@
+import glob
+import json
+import logging
+import os
+import re
+
+from selenium.webdriver.common.by import By
+
+from .base_scraper import BaseScraper, compile_selectors
+from config import PROFILE_FIELDS
+
+SPEC_DIR = os.path.join(os.path.dirname(__file__), 'specs')
+
+class ScraperSpec:
+    r"""
+    Data-driven description of how to scrape one directory.
+    
+    A spec is a JSON document:
+
+        {
+          "domain": "webmd.com",
+          "ready_selector": "h1",
+          "needs_javascript": false,
+          "required_fields": ["name"],
+          "fields": {
+            "name": {"selectors": ["h1.provider-name", "h1"]},
+            "phone": {"selectors": [".phone"], "clean": "phone"},
+            "website": {"selectors": ["a.website"], "attribute": "href", "require": "http"},
+            "has_photo": {"selectors": [".photo img"], "attribute": "src",
+                          "reject": ["placeholder", "default"]}
+          },
+          "text_fallbacks": {"phone": "\\(?\\d{3}\\)?[-.\\s]?\\d{3}[-.\\s]?\\d{4}"}
+        }
+    
+    Selector cascades are compiled to XPath once when the spec is loaded.
+    Post-processing keys per field: "attribute" reads an attribute instead
+    of the text, "clean": "phone" keeps only phone characters, "require"
+    and "reject" accept or drop values by substring, and "pattern" keeps
+    the first regex match. text_fallbacks are regexes searched over the
+    visible page text for fields still empty after every selector.
+    """
+    
+    def __init__(self, spec):
+        self.domain = spec['domain']
+        self.ready_selector = spec.get('ready_selector')
+        self.needs_javascript = bool(spec.get('needs_javascript', False))
+        self.required_fields = tuple(spec.get('required_fields', ('name',)))
+        
+        fields = spec.get('fields', {})
+        unknown = [field for field in list(fields) + list(spec.get('text_fallbacks', {})) if field not in PROFILE_FIELDS]
+        if unknown:
+            raise ValueError(f"Spec for {self.domain} declares unknown fields: {', '.join(unknown)}")
+        
+        self.field_selectors = {field: list(rule['selectors']) for field, rule in fields.items()}
+        self.field_attributes = {field: rule['attribute'] for field, rule in fields.items() if rule.get('attribute')}
+        self.rules = {
+            field: {
+                'clean': rule.get('clean'),
+                'require': rule.get('require'),
+                'reject': [word.lower() for word in rule.get('reject', [])],
+                'pattern': re.compile(rule['pattern']) if rule.get('pattern') else None,
+            }
+            for field, rule in fields.items()
+        }
+        self.text_fallbacks = {field: re.compile(pattern) for field, pattern in spec.get('text_fallbacks', {}).items()}
+        self.plan = compile_selectors(self.field_selectors)
+    
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+def load_specs(directory=SPEC_DIR):
+    """Load and compile every *.json spec in a directory, keyed by domain"""
+    logger = logging.getLogger(__name__)
+    specs = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        try:
+            spec = ScraperSpec.from_file(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Skipping invalid scraper spec {path}: {str(e)}")
+            continue
+        specs[spec.domain] = spec
+    return specs
+
+class SpecScraper(BaseScraper):
+    """Scraper driven entirely by a ScraperSpec"""
+    
+    def __init__(self, spec):
+        super().__init__()
+        self.spec = spec
+        self.field_selectors = spec.field_selectors
+        self.field_attributes = spec.field_attributes
+        self.required_fields = spec.required_fields
+        self.needs_javascript = spec.needs_javascript
+        if spec.ready_selector:
+            self.ready_locator = (By.CSS_SELECTOR, spec.ready_selector)
+    
+    def get_domain(self):
+        return self.spec.domain
+    
+    def get_selector_plan(self):
+        return self.spec.plan
+    
+    def clean_field(self, field, value):
+        """Apply the spec's post-processing rules on top of the default cleanup"""
+        rule = self.spec.rules.get(field)
+        if rule is None:
+            return super().clean_field(field, value)
+        
+        value = ' '.join(value.split())
+        if rule['clean'] == 'phone':
+            value = re.sub(r'[^\d\-\(\)\s\+]', '', value).strip()
+        if rule['pattern']:
+            match = rule['pattern'].search(value)
+            value = match.group() if match else ''
+        if rule['require'] and rule['require'] not in value:
+            value = ''
+        if any(word in value.lower() for word in rule['reject']):
+            value = ''
+        
+        if field == 'has_photo':
+            return bool(value)
+        return value
+    
+    def complete_profile(self, profile_data, tree):
+        """Search the page text for fields the selectors missed"""
+        if self.spec.text_fallbacks:
+            text = self.visible_text(tree)
+            for field, pattern in self.spec.text_fallbacks.items():
+                if not profile_data[field]:
+                    match = pattern.search(text)
+                    if match:
+                        profile_data[field] = match.group()
+        
+        return profile_data
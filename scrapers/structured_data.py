@@ -0,0 +1,170 @@
+import json
+import re
+from urllib.parse import urlparse
+
+# Most specific first: a Physician node beats the practice it belongs to
+PROFILE_TYPES = [
+    'Physician',
+    'Dentist',
+    'Person',
+    'MedicalClinic',
+    'MedicalBusiness',
+    'MedicalOrganization',
+]
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def _node_types(node):
+    return [str(node_type).rsplit('/', 1)[-1] for node_type in _as_list(node.get('@type'))]
+
+def _text(value):
+    """Flatten a schema.org value (string, list or object with a name) into text"""
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('@value') or ''
+    if isinstance(value, list):
+        return ', '.join(text for text in (_text(item) for item in value) if text)
+    return ' '.join(str(value).split()) if value is not None else ''
+
+_CAMEL_CASE_BOUNDARY = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+def _specialty(value):
+    """Render medicalSpecialty, turning enumeration URLs like https://schema.org/Cardiovascular into their name"""
+    specialties = []
+    for item in _as_list(value):
+        text = _text(item)
+        if text.startswith(('http://', 'https://', 'schema:')):
+            # The enumeration member is the last path segment, e.g. PhysicalTherapy -> Physical Therapy
+            segment = urlparse(text).path.rstrip('/').rsplit('/', 1)[-1].rsplit(':', 1)[-1]
+            text = _CAMEL_CASE_BOUNDARY.sub(' ', segment)
+        if text:
+            specialties.append(text)
+    return ', '.join(specialties)
+
+def _format_address(value):
+    """Render a PostalAddress (or plain string) as a single line"""
+    value = _as_list(value)[0] if isinstance(value, list) and value else value
+    if not isinstance(value, dict):
+        return _text(value)
+
+    region = ' '.join(part for part in (_text(value.get('addressRegion')), _text(value.get('postalCode'))) if part)
+    parts = [_text(value.get('streetAddress')), _text(value.get('addressLocality')), region]
+    return ', '.join(part for part in parts if part)
+
+def _image_url(value):
+    value = _as_list(value)[0] if isinstance(value, list) and value else value
+    if isinstance(value, dict):
+        value = value.get('url') or value.get('contentUrl') or ''
+    return str(value or '')
+
+def _walk_json_ld(data):
+    """Yield every object node in a JSON-LD document, including @graph members"""
+    for node in _as_list(data):
+        if not isinstance(node, dict):
+            continue
+        yield node
+        for key in ('@graph', 'mainEntity', 'employee', 'member'):
+            yield from _walk_json_ld(node.get(key))
+
+def _json_ld_nodes(tree):
+    nodes = []
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text or '')
+        except ValueError:
+            continue
+        nodes.extend(_walk_json_ld(data))
+    return nodes
+
+def _microdata_value(element):
+    if element.get('content') is not None:
+        return element.get('content')
+    if element.tag in ('a', 'link'):
+        return element.get('href', '')
+    if element.tag in ('img', 'source'):
+        return element.get('src', '')
+    if element.tag == 'meta':
+        return element.get('content', '')
+    return element.text_content()
+
+def _microdata_node(scope):
+    """Convert an itemscope element into a JSON-LD-like dict"""
+    node = {'@type': scope.get('itemtype', '')}
+    for element in scope.xpath('.//*[@itemprop]'):
+        # Properties belong to the nearest enclosing itemscope only
+        owner = element.getparent()
+        while owner is not None and owner.get('itemscope') is None:
+            owner = owner.getparent()
+        if owner is not scope:
+            continue
+
+        prop = element.get('itemprop')
+        if element.get('itemscope') is not None:
+            value = _microdata_node(element)
+        else:
+            value = _microdata_value(element)
+        node.setdefault(prop, value)
+    return node
+
+def _microdata_nodes(tree):
+    return [
+        _microdata_node(scope)
+        for scope in tree.xpath('//*[@itemscope and contains(@itemtype, "schema.org")]')
+    ]
+
+def _pick_profile_node(nodes):
+    for profile_type in PROFILE_TYPES:
+        for node in nodes:
+            if profile_type in _node_types(node):
+                return node
+    return None
+
+def _external_website(node, page_url):
+    """Return the first linked URL that isn't the directory page itself"""
+    page_host = urlparse(page_url or '').netloc.lower().replace('www.', '')
+    for candidate in _as_list(node.get('sameAs')) + _as_list(node.get('url')):
+        candidate = str(candidate or '')
+        host = urlparse(candidate).netloc.lower().replace('www.', '')
+        if candidate.startswith('http') and host and host != page_host:
+            return candidate
+    return ''
+
+def extract_structured_profile(tree, page_url=None):
+    """
+    Return the profile fields declared in schema.org JSON-LD or microdata
+    Directories that embed a Physician (or similar) node describe the
+    doctor more reliably than their markup does. Only fields actually
+    present are returned, so callers can fill the rest from selectors.
+    """
+    node = _pick_profile_node(_json_ld_nodes(tree)) or _pick_profile_node(_microdata_nodes(tree))
+    if node is None:
+        return {}
+
+    name = _text(node.get('name'))
+    if not name and (node.get('givenName') or node.get('familyName')):
+        name = ' '.join(
+            _text(node.get(part)) for part in ('honorificPrefix', 'givenName', 'familyName') if node.get(part)
+        )
+
+    address = node.get('address')
+    if address is None and isinstance(node.get('location'), (dict, list)):
+        location = _as_list(node.get('location'))[0]
+        address = location.get('address') if isinstance(location, dict) else None
+
+    telephone = _text(node.get('telephone'))
+    if not telephone and isinstance(address, dict):
+        telephone = _text(address.get('telephone'))
+
+    image = _image_url(node.get('image'))
+
+    found = {
+        'name': name,
+        'phone': telephone,
+        'address': _format_address(address) if address is not None else '',
+        'website': _external_website(node, page_url),
+        'specialty': _specialty(node.get('medicalSpecialty')),
+        'has_photo': bool(image) and 'placeholder' not in image.lower() and 'default' not in image.lower()
+    }
+    return {field: value for field, value in found.items() if value}
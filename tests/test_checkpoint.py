@@ -0,0 +1,101 @@
+import io
+
+import pandas as pd
+
+import batch_audit
+from utils.audit_runner import process_doctor_profile
+from utils.checkpoint import CheckpointJournal
+from utils.comparison import ProfileComparator
+from utils.records import ScrapedProfile
+
+DOCTOR = {'Name': 'Dr. Jane Smith', 'Location': 'Towson MD', 'Website': 'https://smithortho.com'}
+
+class FakeSearchEngine:
+    def __init__(self, results):
+        self.results = results
+        self.searched = []
+    
+    def search_doctor_all_domains(self, doctor_name, location, domains):
+        self.searched.append(list(domains))
+        return {domain: self.results[domain] for domain in domains}
+
+class FakeScrapes:
+    """Stands in for SingleFlightScrapes, serving canned profiles by URL"""
+    
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.fetched = []
+    
+    def get(self, url, fetch):
+        self.fetched.append(url)
+        return self.profiles[url]
+
+def test_resume_skips_done_domains(tmp_path):
+    search_results = {
+        'vitals.com': ['https://www.vitals.com/doctors/jane-smith'],
+        'webmd.com': [],
+        'healthgrades.com': ['https://www.healthgrades.com/physician/jane-smith'],
+    }
+    profiles = {
+        'https://www.vitals.com/doctors/jane-smith': ScrapedProfile(
+            name='Jane Smith', website='smithortho.com', directory='vitals.com',
+            profile_url='https://www.vitals.com/doctors/jane-smith'
+        ),
+        'https://www.healthgrades.com/physician/jane-smith': ScrapedProfile(
+            directory='healthgrades.com', profile_url='https://www.healthgrades.com/physician/jane-smith',
+            error='WebDriverException: chrome not reachable'
+        ),
+    }
+    domains = list(search_results)
+    comparator = ProfileComparator()
+    
+    journal = CheckpointJournal('audit', directory=str(tmp_path))
+    first = process_doctor_profile(DOCTOR, domains, FakeSearchEngine(search_results), comparator,
+                                   journal=journal, scrapes=FakeScrapes(profiles))
+    journal.close()
+    
+    # Re-open from disk, as a restarted audit would
+    journal = CheckpointJournal('audit', directory=str(tmp_path))
+    search_engine = FakeSearchEngine(search_results)
+    scrapes = FakeScrapes(profiles)
+    second = process_doctor_profile(DOCTOR, domains, search_engine, comparator, journal=journal, scrapes=scrapes)
+    journal.close()
+    
+    # Only the domain whose scrape failed is searched and scraped again
+    assert search_engine.searched == [['healthgrades.com']]
+    assert scrapes.fetched == ['https://www.healthgrades.com/physician/jane-smith']
+    assert sorted(result.directory for result in second) == sorted(result.directory for result in first)
+    restored = {result.directory: result for result in second}
+    assert restored['vitals.com'].name.status == 'Match'
+    assert restored['webmd.com'].profile_url == 'No results found'
+
+def test_journal_reset_discards_progress(tmp_path):
+    journal = CheckpointJournal('audit', directory=str(tmp_path))
+    journal.record_result('doctor', 'vitals.com', 'https://example.com/a', {'score': 1})
+    journal.mark_domain_done('doctor', 'vitals.com')
+    
+    journal.reset()
+    
+    assert journal.completed_count() == 0
+    assert not journal.is_domain_done('doctor', 'vitals.com')
+    assert journal.get_result('doctor', 'vitals.com', 'https://example.com/a') is None
+    journal.close()
+
+def test_failed_doctor_still_gets_output_rows(tmp_path, monkeypatch):
+    roster = tmp_path / 'roster.csv'
+    pd.DataFrame([DOCTOR, {'Name': 'Dr. Bob Lee', 'Location': 'Baltimore MD', 'Website': ''}]).to_csv(roster, index=False)
+    
+    def process(doctor_data, domains, *args):
+        raise RuntimeError('search backend exploded')
+    
+    monkeypatch.setattr(batch_audit, 'process_doctor_profile', process)
+    monkeypatch.setattr(batch_audit, 'SearchEngine', lambda max_results: None)
+    monkeypatch.setattr(batch_audit, 'CheckpointJournal', lambda audit_id: CheckpointJournal(audit_id, str(tmp_path)))
+    
+    output = io.StringIO()
+    doctors_done, rows_written = batch_audit.run_batch_audit(str(roster), output, ['vitals.com', 'webmd.com'])
+    
+    rows = pd.read_csv(io.StringIO(output.getvalue()))
+    assert (doctors_done, rows_written) == (2, 4)
+    assert sorted(rows['Doctor Name'].unique()) == ['Dr. Bob Lee', 'Dr. Jane Smith']
+    assert (rows['Error'] == 'search backend exploded').all()
@@ -0,0 +1,51 @@
+import random
+
+from utils.comparison import ProfileComparator
+
+ROSTER_NAMES = ['Dr. Jane Smith', 'John A. Carter, MD', 'Maria de la Cruz', 'Dr. Li Wei', 'Robert Johnson Jr.']
+
+def name_variants(name, rng, count=40):
+    """Typos, dropped words and reordered words of a roster name"""
+    variants = []
+    for _ in range(count):
+        chars = list(name)
+        for _ in range(rng.randint(0, 4)):
+            i = rng.randrange(len(chars))
+            op = rng.choice('dis')
+            if op == 'd' and len(chars) > 1:
+                del chars[i]
+            elif op == 'i':
+                chars.insert(i, rng.choice('aeimnorst '))
+            else:
+                chars[i] = rng.choice('aeimnorst')
+        words = ''.join(chars).split()
+        if len(words) > 1 and rng.random() < 0.3:
+            rng.shuffle(words)
+        variants.append(' '.join(words))
+    return variants
+
+def test_compare_many_scores_match_similarity_score():
+    comparator = ProfileComparator()
+    rng = random.Random(7)
+    
+    for roster_name in ROSTER_NAMES:
+        scraped_names = name_variants(roster_name, rng) + ['Smith Jane', 'Dr. Jane Smith', '']
+        results = comparator.compare_many({'Name': roster_name}, [{'name': name} for name in scraped_names])
+        
+        for scraped_name, result in zip(scraped_names, results):
+            expected_status, expected_score = comparator.compare_names(roster_name, scraped_name)
+            assert result.name.score == comparator.similarity_score(roster_name, scraped_name)
+            assert (result.name.status, result.name.score) == (expected_status, expected_score)
+
+def test_compare_profiles_name_status_matches_compare_names():
+    comparator = ProfileComparator()
+    rng = random.Random(11)
+    
+    for roster_name in ROSTER_NAMES:
+        for scraped_name in name_variants(roster_name, rng) + ['Someone Else Entirely']:
+            result = comparator.compare_profiles({'Name': roster_name}, {'name': scraped_name})
+            expected_status, expected_score = comparator.compare_names(roster_name, scraped_name)
+            
+            assert result.name.status == expected_status
+            if expected_status == "Match":
+                assert result.name.score == expected_score
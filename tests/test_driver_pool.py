@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from scrapers.driver_pool import DriverPool, DriverPoolExhausted
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+    
+    def quit(self):
+        self.quit_called = True
+
+class FakePool(DriverPool):
+    """DriverPool that hands out fake drivers instead of starting Chrome"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started = []
+    
+    def _create_driver(self):
+        driver = FakeDriver()
+        self.started.append(driver)
+        return driver
+    
+    def _is_healthy(self, driver):
+        return not driver.quit_called
+    
+    def _reset(self, driver):
+        return True
+
+def test_worn_out_release_wakes_waiter():
+    pool = FakePool(size=1, max_uses=1)
+    first = pool.acquire(timeout=1)
+    
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    
+    # The only driver is worn out, so it is discarded rather than returned to the idle stack
+    pool.release(first)
+    waiter.join(timeout=5)
+    
+    assert not waiter.is_alive()
+    assert first.quit_called
+    assert len(got) == 1 and got[0] is not first
+    assert len(pool.started) == 2
+
+def test_released_driver_is_reused():
+    pool = FakePool(size=1, max_uses=10)
+    
+    with pool.driver(timeout=1) as first:
+        pass
+    with pool.driver(timeout=1) as second:
+        pass
+    
+    assert first is second
+    assert len(pool.started) == 1
+
+def test_acquire_times_out_when_pool_is_full():
+    pool = FakePool(size=1, max_uses=10)
+    pool.acquire(timeout=1)
+    
+    with pytest.raises(DriverPoolExhausted):
+        pool.acquire(timeout=0.05)
+
+def test_close_wakes_waiters():
+    pool = FakePool(size=1, max_uses=10)
+    pool.acquire(timeout=1)
+    
+    errors = []
+    def wait_for_driver():
+        try:
+            pool.acquire(timeout=5)
+        except DriverPoolExhausted as e:
+            errors.append(e)
+    waiter = threading.Thread(target=wait_for_driver)
+    waiter.start()
+    
+    pool.close()
+    waiter.join(timeout=5)
+    
+    assert not waiter.is_alive()
+    assert len(errors) == 1
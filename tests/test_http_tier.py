@@ -0,0 +1,41 @@
+from scrapers.http_fetcher import HttpFetcher
+from scrapers.vitals_scraper import VitalsScraper
+
+class StubFetcher(HttpFetcher):
+    """HttpFetcher that serves a fixed body instead of going to the network"""
+    
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+    
+    def fetch(self, url, domain):
+        return self.body
+
+class NoLimit:
+    def acquire(self, url):
+        pass
+
+def test_xhtml_with_encoding_declaration_parses():
+    page = (
+        b'<?xml version="1.0" encoding="iso-8859-1"?>\n'
+        b'<html xmlns="http://www.w3.org/1999/xhtml"><body><h1>Dr. Jos\xe9 Ruiz</h1></body></html>'
+    )
+    
+    tree = HttpFetcher().parse(page)
+    
+    assert tree.xpath('//h1/text()') == ['Dr. José Ruiz']
+
+def test_decoded_text_with_encoding_declaration_parses():
+    page = '<?xml version="1.0" encoding="utf-8"?><html><body><h1>Dr. José Ruiz</h1></body></html>'
+    
+    tree = HttpFetcher().parse(page)
+    
+    assert tree.xpath('//h1/text()') == ['Dr. José Ruiz']
+
+def test_empty_body_escalates_to_browser():
+    scraper = VitalsScraper(http_fetcher=StubFetcher(b''), rate_limiter=NoLimit())
+    
+    profile_data, reason = scraper.fetch_with_http('https://www.vitals.com/doctors/jane-smith')
+    
+    assert profile_data is None
+    assert reason.startswith('unparseable html')
@@ -0,0 +1,98 @@
+import time
+
+from utils.comparison import ProfileComparator
+from utils.job_queue import JobQueue
+from utils.records import ScrapedProfile
+from worker import QueueWorker
+
+DOCTOR = {'Name': 'Dr. Jane Smith', 'Location': 'Towson MD', 'Website': 'https://smithortho.com'}
+PROFILE_URL = 'https://www.vitals.com/doctors/jane-smith'
+
+class FakeSearchEngine:
+    def search_doctor_all_domains(self, doctor_name, location, domains):
+        return {domain: [PROFILE_URL] if domain == 'vitals.com' else [] for domain in domains}
+
+class ScriptedScrapes:
+    """Stands in for SingleFlightScrapes, returning the next scripted profile on every request"""
+    
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+    
+    def get(self, url, fetch):
+        return self.profiles.pop(0)
+
+def make_worker(queue, profiles):
+    worker = QueueWorker(queue, 'worker-1', doctor_workers=1, scrape_workers=1, poll_seconds=0.01,
+                         search_engine=FakeSearchEngine(), comparator=ProfileComparator())
+    worker.scrapes = ScriptedScrapes(profiles)
+    return worker
+
+def crashed():
+    return ScrapedProfile(directory='vitals.com', profile_url=PROFILE_URL, error='WebDriverException: chrome not reachable')
+
+def found():
+    return ScrapedProfile(name='Jane Smith', website='smithortho.com', directory='vitals.com', profile_url=PROFILE_URL)
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), lease_seconds=0.1)
+    queue.enqueue('audit', [DOCTOR], ['vitals.com', 'webmd.com'])
+    
+    first = queue.claim('worker-1')
+    assert sorted(job.domain for job in first) == ['vitals.com', 'webmd.com']
+    assert queue.claim('worker-2') == []
+    
+    time.sleep(0.2)
+    second = queue.claim('worker-2')
+    
+    assert sorted(job.id for job in second) == sorted(job.id for job in first)
+    assert all(job.attempts == 2 for job in second)
+    # The worker whose lease expired can no longer complete or renew the job
+    assert not queue.complete('worker-1', first[0].id, [])
+    assert queue.heartbeat('worker-1', [job.id for job in first]) == []
+    assert queue.complete('worker-2', second[0].id, [])
+    queue.close()
+
+def test_lease_expiry_uses_up_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), lease_seconds=0.05, max_attempts=1)
+    queue.enqueue('audit', [DOCTOR], ['vitals.com'])
+    
+    assert len(queue.claim('worker-1')) == 1
+    time.sleep(0.1)
+    
+    assert queue.claim('worker-2') == []
+    ((_, _, domain, results, error),) = queue.finished_jobs('audit')
+    assert (domain, results, error) == ('vitals.com', [], 'lease expired')
+    assert queue.progress('audit')['failed'] == 1
+    queue.close()
+
+def test_failed_rows_are_retried(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), max_attempts=2)
+    queue.enqueue('audit', [DOCTOR], ['vitals.com', 'webmd.com'])
+    worker = make_worker(queue, [crashed(), found()])
+    
+    worker.run_jobs(queue.claim(worker.worker_id), None)
+    
+    # webmd.com had no results, which is a finished row; vitals.com's crash goes back to the queue
+    progress = queue.progress('audit')
+    assert (progress['done'], progress['pending']) == (1, 1)
+    
+    (retry,) = queue.claim(worker.worker_id)
+    assert (retry.domain, retry.attempts) == ('vitals.com', 2)
+    worker.run_jobs([retry], None)
+    
+    finished = {domain: results for _, _, domain, results, _ in queue.finished_jobs('audit')}
+    assert queue.progress('audit')['done'] == 2
+    assert finished['vitals.com'][0]['comparisons']['name']['status'] == 'Match'
+    queue.close()
+
+def test_last_attempt_keeps_failed_rows(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), max_attempts=1)
+    queue.enqueue('audit', [DOCTOR], ['vitals.com'])
+    worker = make_worker(queue, [crashed()])
+    
+    worker.run_jobs(queue.claim(worker.worker_id), None)
+    
+    ((_, _, _, results, _),) = queue.finished_jobs('audit')
+    assert queue.progress('audit')['done'] == 1
+    assert results[0]['error'] == 'WebDriverException: chrome not reachable'
+    queue.close()
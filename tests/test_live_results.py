@@ -0,0 +1,46 @@
+from utils.audit_runner import build_error_result
+from utils.comparison import ProfileComparator
+from utils.live_results import LiveAuditResults
+from utils.records import ScrapedProfile, NO_RESULTS_URL, SEARCH_FAILED_URL
+
+ROSTER = {'Name': 'Dr. Jane Smith', 'Location': 'Towson MD', 'Website': 'https://smithortho.com'}
+
+def scraped(**fields):
+    return ScrapedProfile(directory='vitals.com', profile_url='https://www.vitals.com/doctors/jane-smith', **fields)
+
+def test_errored_scrape_counts_as_directory_error():
+    comparator = ProfileComparator()
+    live = LiveAuditResults()
+    
+    live.add([comparator.compare_profiles(ROSTER, scraped(error='WebDriverException: chrome not reachable'))])
+    
+    (health,) = live.domain_health()
+    assert health['Directory'] == 'vitals.com'
+    assert health['Errors'] == 1
+    assert health['Error Rate'] == 1.0
+    assert health['Last Error'] == 'WebDriverException: chrome not reachable'
+    assert live.summary()['avg_score'] == 0.0
+
+def test_failed_search_is_an_error_but_no_results_is_not():
+    record = ProfileComparator().prepare_record(ROSTER)
+    live = LiveAuditResults()
+    
+    live.add([
+        build_error_result(record, 'vitals.com', NO_RESULTS_URL, 'No search results found'),
+        build_error_result(record, 'webmd.com', SEARCH_FAILED_URL, 'Search failed: status 429'),
+    ])
+    
+    health = {row['Directory']: row for row in live.domain_health()}
+    assert health['vitals.com']['Errors'] == 0
+    assert health['vitals.com']['No Results'] == 1
+    assert health['webmd.com']['Errors'] == 1
+    assert health['webmd.com']['Error Rate'] == 1.0
+
+def test_clean_scrape_is_not_an_error():
+    live = LiveAuditResults()
+    
+    live.add([ProfileComparator().compare_profiles(ROSTER, scraped(name='Dr. Jane Smith'))])
+    
+    (health,) = live.domain_health()
+    assert health['Errors'] == 0
+    assert health['Matches'] == 1
@@ -0,0 +1,43 @@
+from lxml import html as lxml_html
+
+from scrapers.scraper_factory import GenericScraper
+from scrapers.structured_data import extract_structured_profile
+
+PAGE = """
+<html>
+  <head>
+    <title>Dr. Jane Smith</title>
+    <script>window.analytics = {account: "410-555-0000"};</script>
+    <style>.phone:before { content: "800-555-1111"; }</style>
+  </head>
+  <body>
+    <noscript><img src="https://pixel.example.com/?id=2125550199"></noscript>
+    <script>var tracking = "3015550100";</script>
+    <p>Call the office at (410) 555-1234 for appointments.</p>
+  </body>
+</html>
+"""
+
+def test_phone_fallback_skips_scripts_and_styles():
+    scraper = GenericScraper('smithortho.com')
+    profile_data = scraper.parse_html(lxml_html.fromstring(PAGE), 'https://smithortho.com/')
+    
+    assert profile_data['phone'] == '(410) 555-1234'
+
+def test_phone_fallback_ignores_script_only_numbers():
+    page = '<html><body><script>var id = "4105551234";</script><p>No phone listed</p></body></html>'
+    scraper = GenericScraper('smithortho.com')
+    
+    profile_data = scraper.complete_profile(scraper.empty_profile(), lxml_html.fromstring(page))
+    
+    assert profile_data['phone'] == ''
+
+def test_schema_specialty_urls_become_names():
+    page = """<html><head><script type="application/ld+json">
+    {"@type": "Physician", "name": "Dr. Jane Smith",
+     "medicalSpecialty": ["https://schema.org/Cardiovascular", "http://schema.org/PhysicalTherapy", "Sports Medicine"]}
+    </script></head><body></body></html>"""
+    
+    found = extract_structured_profile(lxml_html.fromstring(page), 'https://www.vitals.com/doctors/jane-smith')
+    
+    assert found['specialty'] == 'Cardiovascular, Physical Therapy, Sports Medicine'
@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.records import ScrapedProfile
+from utils.scrape_dedup import SingleFlightScrapes
+
+URLS = [
+    'https://www.vitals.com/doctors/jane-smith',
+    'https://vitals.com/doctors/jane-smith/',
+    'https://www.vitals.com/doctors/jane-smith?utm_source=search',
+    'https://www.vitals.com/doctors/jane-smith',
+]
+
+def test_concurrent_identical_urls_fetch_once():
+    scrapes = SingleFlightScrapes()
+    release = threading.Event()
+    calls = []
+    
+    def fetch(url):
+        calls.append(url)
+        # Hold the first fetch open until every requester has joined it
+        release.wait(5)
+        return ScrapedProfile(name='Jane Smith', directory='vitals.com', profile_url=url)
+    
+    with ThreadPoolExecutor(max_workers=len(URLS)) as executor:
+        futures = [executor.submit(scrapes.get, url, fetch) for url in URLS]
+        while scrapes.stats()['joined'] < len(URLS) - 1:
+            time.sleep(0.01)
+        release.set()
+        profiles = [future.result(timeout=5) for future in futures]
+    
+    assert len(calls) == 1
+    assert scrapes.stats()['fetches'] == 1
+    # Each requester gets its own copy, pointing at the URL it asked for
+    assert [profile.profile_url for profile in profiles] == URLS
+    assert len({id(profile) for profile in profiles}) == len(URLS)
+    assert all(profile.name == 'Jane Smith' for profile in profiles)
+
+def test_failed_scrape_is_retried():
+    scrapes = SingleFlightScrapes()
+    results = iter([
+        ScrapedProfile(directory='vitals.com', error='WebDriverException: chrome not reachable'),
+        ScrapedProfile(name='Jane Smith', directory='vitals.com'),
+    ])
+    
+    first = scrapes.get(URLS[0], lambda url: next(results))
+    second = scrapes.get(URLS[0], lambda url: next(results))
+    
+    assert first.error
+    assert second.name == 'Jane Smith' and second.error is None
+    assert scrapes.stats()['fetches'] == 2
@@ -0,0 +1,30 @@
+import sqlite3
+
+from utils.search_engine import SearchEngine
+
+class LockedCache:
+    """A search cache whose database is always locked by another process"""
+    
+    def get(self, query, ignore_ttl=False):
+        raise sqlite3.OperationalError('database is locked')
+    
+    def put(self, query, urls):
+        raise sqlite3.OperationalError('database is locked')
+
+class NoLimit:
+    def acquire(self, key):
+        pass
+
+def backend(query, num_results=10):
+    return ['https://www.vitals.com/doctors/jane-smith', 'https://www.webmd.com/doctor/jane-smith']
+
+def test_locked_cache_falls_through_to_search():
+    engine = SearchEngine(max_results=3, rate_limiter=NoLimit(), cache=LockedCache(), search_backend=backend)
+    
+    assert engine.search_doctor_on_domain('Jane Smith', 'Towson MD', 'vitals.com') == [
+        'https://www.vitals.com/doctors/jane-smith'
+    ]
+    assert engine.search_doctor_on_domains('Jane Smith', 'Towson MD', ['vitals.com', 'webmd.com']) == {
+        'vitals.com': ['https://www.vitals.com/doctors/jane-smith'],
+        'webmd.com': ['https://www.webmd.com/doctor/jane-smith'],
+    }
@@ -0,0 +1,221 @@
+import logging
+from concurrent.futures import as_completed
+
+from config import EARLY_EXIT_SCORE
+from scrapers.scraper_factory import ScraperFactory
+from .checkpoint import doctor_key
+from .url_canonical import canonicalize_url
+from .metrics import get_metrics
+from .candidates import rank_candidates
+from .records import ScrapedProfile, ComparisonResult, RosterRecord, NO_RESULTS_URL, SEARCH_FAILED_URL
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = ['Name', 'Location', 'Website']
+
+def build_error_result(record, domain, profile_url, error):
+    """Build a result row for a (domain, url) that produced no comparison"""
+    return ComparisonResult(record, domain, profile_url, error=error)
+
+def build_doctor_error_results(doctor_data, domains, error):
+    """Build one error row per domain for a doctor whose processing raised"""
+    record = RosterRecord(doctor_data.get('Name', ''), doctor_data.get('Location', ''), doctor_data.get('Website', ''))
+    return [build_error_result(record, domain, '', error) for domain in domains]
+
+def is_failed(result):
+    """Whether a row records a failed search, scrape or compare, as opposed to a finished one"""
+    return bool(result.error) and result.profile_url != NO_RESULTS_URL
+
+def scrape_profile(domain, url):
+    """Scrape one profile URL with a fresh scraper for its domain"""
+    logger.info(f"Scraping {url}")
+    # Scrapers hold per-fetch state, so each task gets its own instance
+    scraper = ScraperFactory.get_scraper(domain)
+    return ScrapedProfile.from_dict(scraper.extract_profile_data(url))
+
+def scrape_and_compare(doctor_data, domain, url, comparator, journal=None, record=None, scrapes=None):
+    """
+    Scrape one profile URL and compare it against the roster record
+    record is the doctor's PreparedRecord, so the roster side is only
+    normalized once per doctor rather than once per URL, and every result
+    refers to it rather than copying its values. With an
+    audit-wide SingleFlightScrapes, a URL already scraped (or being
+    scraped) for another row is shared instead of fetched again. Failed
+    rows are not journaled, so a resumed audit tries them again.
+    """
+    if record is None:
+        record = comparator.prepare_record(doctor_data)
+    
+    if journal is not None:
+        # Skip work a previous run already completed
+        journaled = journal.get_result(doctor_key(doctor_data), domain, url)
+        if journaled is not None:
+            return ComparisonResult.from_dict(journaled, record)
+    
+    metrics = get_metrics()
+    try:
+        # Spans opened while scraping this URL are tagged with its doctor and domain
+        with metrics.context(doctor=doctor_data['Name'], domain=domain):
+            with metrics.span('scrape'):
+                if scrapes is not None:
+                    scraped_data = scrapes.get(url, lambda fetch_url: scrape_profile(domain, fetch_url))
+                else:
+                    scraped_data = scrape_profile(domain, url)
+            
+            # Compare with original data
+            with metrics.span('compare'):
+                result = comparator.compare_profiles(record, scraped_data)
+    
+    except Exception as e:
+        logger.error(f"Error processing {url}: {str(e)}")
+        result = build_error_result(record, domain, url, str(e))
+    
+    if journal is not None and not is_failed(result):
+        journal.record_result(doctor_key(doctor_data), domain, url, result.to_dict())
+    return result
+
+def scrape_candidates(doctor_data, domain, urls, comparator, journal=None, record=None, scrapes=None,
+                      early_exit_score=EARLY_EXIT_SCORE):
+    """
+    Scrape one domain's candidate URLs in order, stopping at a good match
+    urls should be ranked best-first. Once a result reaches
+    early_exit_score the remaining candidates are skipped; with None,
+    every candidate is scraped.
+    """
+    results = []
+    for position, url in enumerate(urls):
+        result = scrape_and_compare(doctor_data, domain, url, comparator, journal, record, scrapes)
+        results.append(result)
+        
+        if early_exit_score is not None and not result.error and result.overall_score >= early_exit_score:
+            skipped = len(urls) - position - 1
+            if skipped:
+                logger.info(f"{domain}: {url} scored {result.overall_score:.2f}, skipping {skipped} other candidates")
+            break
+    return results
+
+def process_doctor_profile(doctor_data, domains, search_engine, comparator, executor=None, journal=None,
+                           scrapes=None, early_exit_score=EARLY_EXIT_SCORE):
+    """
+    Process a single doctor's profile across all domains
+    Each domain's candidate URLs are ranked by how well they match the
+    doctor before anything is fetched, then scraped best-first until one
+    reaches early_exit_score. Domains run as separate chains on the given
+    executor when one is passed, otherwise serially; results are returned
+    in completion order. With a checkpoint journal, completed work is
+    replayed instead of redone and every new result is journaled as soon
+    as it is produced. URLs are canonicalized, so variants of one profile
+    are scraped once per doctor, and once per audit when a shared
+    SingleFlightScrapes is passed.
+    """
+    metrics = get_metrics()
+    with metrics.context(doctor=doctor_data['Name']), metrics.span('doctor'):
+        return _process_doctor_profile(
+            doctor_data, domains, search_engine, comparator, executor, journal, scrapes, early_exit_score
+        )
+
+def _process_doctor_profile(doctor_data, domains, search_engine, comparator, executor, journal, scrapes,
+                            early_exit_score):
+    doctor_name = doctor_data['Name']
+    location = doctor_data['Location']
+    key = doctor_key(doctor_data)
+    
+    logger.info(f"Processing {doctor_name} in {location}")
+    
+    profile_results = []
+    
+    # Normalize the roster side once; every result for this doctor refers to it
+    record = comparator.prepare_record(doctor_data)
+    
+    # Domains finished in a previous run come straight from the journal
+    pending_domains = domains
+    if journal is not None:
+        pending_domains = []
+        for domain in domains:
+            if journal.is_domain_done(key, domain):
+                profile_results.extend(
+                    ComparisonResult.from_dict(journaled, record) for journaled in journal.results_for(key, domain)
+                )
+            else:
+                pending_domains.append(domain)
+        
+        if not pending_domains:
+            logger.info(f"Restored {doctor_name} from checkpoint")
+            return profile_results
+    
+    # Search across all domains
+    try:
+        search_results = search_engine.search_doctor_all_domains(doctor_name, location, pending_domains)
+    except Exception as e:
+        # Not journaled, so a resumed audit searches these domains again
+        logger.error(f"Search failed for {doctor_name}: {str(e)}")
+        profile_results.extend(
+            build_error_result(record, domain, SEARCH_FAILED_URL, f"Search failed: {str(e)}")
+            for domain in pending_domains
+        )
+        return profile_results
+    
+    candidates = {}
+    
+    # Process each domain's results
+    for domain, urls in search_results.items():
+        if not urls:
+            # No results found for this domain
+            result = build_error_result(record, domain, NO_RESULTS_URL, 'No search results found')
+            profile_results.append(result)
+            if journal is not None:
+                journal.record_result(key, domain, result.profile_url, result.to_dict())
+            continue
+        
+        # Tracking parameters, "www." and trailing slashes don't make a new
+        # profile; keep the first URL search returned for each canonical form
+        unique_urls = {}
+        for url in urls:
+            unique_urls.setdefault(canonicalize_url(url), url)
+        candidates[domain] = rank_candidates(list(unique_urls.values()), doctor_name, location)
+    
+    if executor is None:
+        for domain, urls in candidates.items():
+            profile_results.extend(scrape_candidates(
+                doctor_data, domain, urls, comparator, journal, record, scrapes, early_exit_score
+            ))
+    else:
+        futures = [
+            executor.submit(
+                scrape_candidates, doctor_data, domain, urls, comparator, journal, record, scrapes, early_exit_score
+            )
+            for domain, urls in candidates.items()
+        ]
+        for future in as_completed(futures):
+            profile_results.extend(future.result())
+    
+    if journal is not None:
+        # A domain with a failed row stays open so a resumed audit retries it
+        failed_domains = {result.directory for result in profile_results if is_failed(result)}
+        for domain in search_results:
+            if domain not in failed_domains:
+                journal.mark_domain_done(key, domain)
+    
+    return profile_results
+
+def flatten_result(result):
+    """Flatten a comparison result into a display/export row"""
+    name, phone, website = result.name, result.phone, result.website
+    return {
+        'Doctor Name': result.doctor_name,
+        'Directory': result.directory,
+        'Profile URL': result.profile_url,
+        'Overall Score': f"{result.overall_score:.2f}",
+        'Scraped Name': name.scraped if name else '',
+        'Name Match': name.status if name else '',
+        'Scraped Phone': phone.scraped if phone else '',
+        'Phone Match': phone.status if phone else '',
+        'Scraped Website': website.scraped if website else '',
+        'Website Match': website.status if website else '',
+        'Address': result.scraped_address,
+        'Specialty': result.scraped_specialty,
+        'Has Photo': result.has_photo,
+        'Error': result.error or ''
+    }
+
+RESULT_COLUMNS = list(flatten_result(ComparisonResult(RosterRecord('', '', ''), '', '')))
@@ -0,0 +1,57 @@
+import re
+from difflib import SequenceMatcher
+from urllib.parse import urlsplit, unquote
+
+from config import CANDIDATE_NAME_WEIGHT, CANDIDATE_LOCATION_WEIGHT, CANDIDATE_RANK_WEIGHT
+
+_TOKEN = re.compile(r'[a-z]+')
+
+# Name parts that say nothing about which doctor a page is for
+IGNORED_NAME_TOKENS = {'dr', 'doctor', 'md', 'do', 'dds', 'dmd', 'phd', 'np', 'pa', 'jr', 'sr', 'ii', 'iii'}
+
+def tokenize(text):
+    return _TOKEN.findall(unquote(str(text)).lower())
+
+def name_tokens(doctor_name):
+    """Distinctive tokens of a doctor's name, surname last"""
+    return [token for token in tokenize(doctor_name) if token not in IGNORED_NAME_TOKENS and len(token) > 1]
+
+def token_match(token, url_tokens):
+    """How well one name token appears among the URL's tokens: 1 exact, partial for near misses"""
+    if token in url_tokens:
+        return 1.0
+    best = max((SequenceMatcher(None, token, candidate).ratio() for candidate in url_tokens), default=0.0)
+    return best if best >= 0.8 else 0.0
+
+def score_candidate(url, rank, doctor_name, location):
+    """
+    Cheap prior that a search result URL is this doctor's profile
+    Combines how much of the name (surname counting double) and location
+    appears in the URL's path with the result's search rank. Only the URL
+    is looked at, so candidates can be ordered before anything is fetched.
+    """
+    parts = urlsplit(url)
+    url_tokens = set(tokenize(parts.path)) | set(tokenize(parts.query))
+    
+    names = name_tokens(doctor_name)
+    name_score = 0.0
+    if names and url_tokens:
+        weights = [1.0] * (len(names) - 1) + [2.0]
+        name_score = sum(weight * token_match(token, url_tokens) for token, weight in zip(names, weights)) / sum(weights)
+    
+    places = [token for token in tokenize(location) if len(token) > 2]
+    location_score = sum(place in url_tokens for place in places) / len(places) if places else 0.0
+    
+    rank_score = 1.0 / (1 + rank)
+    
+    return (
+        CANDIDATE_NAME_WEIGHT * name_score
+        + CANDIDATE_LOCATION_WEIGHT * location_score
+        + CANDIDATE_RANK_WEIGHT * rank_score
+    )
+
+def rank_candidates(urls, doctor_name, location):
+    """Order search result URLs best-first; ties keep the search engine's order"""
+    scored = [(score_candidate(url, rank, doctor_name, location), rank, url) for rank, url in enumerate(urls)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [url for _, _, url in scored]
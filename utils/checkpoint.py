@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from config import CHECKPOINT_DIR
+
+def compute_audit_id(roster_digest, domains):
+    """Identify an audit by its roster contents and the set of domains searched"""
+    key = roster_digest + '|' + ','.join(sorted(domain.lower() for domain in domains))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+def digest_roster(roster_bytes):
+    """Return the content digest of an uploaded roster"""
+    return hashlib.sha256(roster_bytes).hexdigest()
+
+def digest_roster_file(path, block_size=1 << 20):
+    """Return the content digest of a roster file without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def doctor_key(doctor_data):
+    """Stable key for a roster record across restarts"""
+    return '|'.join(str(doctor_data.get(column, '')) for column in ('Name', 'Location', 'Website'))
+
+class CheckpointJournal:
+    """
+    Durable journal of completed audit work.
+
+    Every (doctor, domain, url) result is committed as soon as it is
+    produced, and a domain is marked done once all of its URLs have been
+    processed. Re-opening the journal for the same audit lets the audit
+    skip everything already recorded. The journal is a SQLite database
+    keyed by doctor and domain, so lookups go to disk and nothing in
+    memory grows with the roster.
+    """
+    
+    def __init__(self, audit_id, directory=CHECKPOINT_DIR):
+        self.audit_id = audit_id
+        self.path = os.path.join(directory, f"{audit_id}.sqlite3")
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Sync every commit so a recorded result survives a crash, as the old fsync'd appends did
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " doctor TEXT NOT NULL,"
+            " domain TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (doctor, domain, url))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS done_domains ("
+            " doctor TEXT NOT NULL,"
+            " domain TEXT NOT NULL,"
+            " PRIMARY KEY (doctor, domain))"
+        )
+        self._conn.commit()
+        
+        completed = self.completed_count()
+        if completed:
+            self.logger.info(f"Loaded checkpoint {audit_id}: {completed} results")
+    
+    def _write(self, query, params):
+        with self._lock:
+            self._conn.execute(query, params)
+            self._conn.commit()
+    
+    def record_result(self, doctor, domain, url, result):
+        """Durably record one completed (doctor, domain, url) result"""
+        self._write(
+            "INSERT INTO results (doctor, domain, url, result) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (doctor, domain, url) DO UPDATE SET result = excluded.result",
+            (doctor, domain, url, json.dumps(result, default=str))
+        )
+    
+    def mark_domain_done(self, doctor, domain):
+        """Record that every URL for a doctor on a domain has been processed"""
+        self._write("INSERT OR IGNORE INTO done_domains (doctor, domain) VALUES (?, ?)", (doctor, domain))
+    
+    def get_result(self, doctor, domain, url):
+        """Return a journaled result, or None if it hasn't been completed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM results WHERE doctor = ? AND domain = ? AND url = ?", (doctor, domain, url)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+    
+    def is_domain_done(self, doctor, domain):
+        """Check whether a doctor/domain pair was fully processed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM done_domains WHERE doctor = ? AND domain = ?", (doctor, domain)
+            ).fetchone()
+        return row is not None
+    
+    def results_for(self, doctor, domain):
+        """Return every journaled result for a doctor on a domain, in the order they were recorded"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM results WHERE doctor = ? AND domain = ? ORDER BY rowid", (doctor, domain)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def completed_count(self):
+        """Number of results already in the journal"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def reset(self):
+        """Discard all recorded progress and start the journal over"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.execute("DELETE FROM done_domains")
+            self._conn.commit()
+    
+    def close(self):
+        """Close the journal database"""
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,44 @@
 import re
 from difflib import SequenceMatcher
+from functools import lru_cache
 import logging
 
+from .records import ScrapedProfile, FieldComparison, ComparisonResult
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[.,;:!?()"]')
+
+@lru_cache(maxsize=65536)
+def _normalize_text(text):
+    # Convert to lowercase and remove extra whitespace
+    normalized = _WHITESPACE.sub(' ', text.lower().strip())
+    
+    # Remove common punctuation
+    return _PUNCTUATION.sub('', normalized)
+
+class PreparedRecord:
+    """Roster record with the values used for comparison normalized once"""
+    
+    __slots__ = ('data', 'name', 'location', 'website', 'has_phone', 'phone',
+                 'normalized_name', 'normalized_phone', 'normalized_website')
+    
+    def __init__(self, comparator, original_data):
+        self.data = original_data
+        self.name = original_data.get('Name', '')
+        self.location = original_data.get('Location', '')
+        self.website = original_data.get('Website', '')
+        self.has_phone = 'Phone' in original_data
+        self.phone = original_data.get('Phone', '')
+        
+        self.normalized_name = comparator.normalize_text(self.name)
+        self.normalized_phone = comparator.normalize_phone(self.phone)
+        self.normalized_website = comparator.normalize_website(self.website) if self.website else ''
+
 class ProfileComparator:
     """Compare scraped profile data with original CSV data"""
     
+    name_threshold = 0.7
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
@@ -13,13 +47,11 @@ class ProfileComparator:
         if not text:
             return ""
         
-        # Convert to lowercase and remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', str(text).lower().strip())
-        
-        # Remove common punctuation
-        normalized = re.sub(r'[.,;:!?()"]', '', normalized)
-        
-        return normalized
+        return _normalize_text(str(text))
+    
+    def normalize_website(self, website):
+        """Normalize a URL for exact comparison"""
+        return self.normalize_text(str(website).replace('http://', '').replace('https://', '').replace('www.', ''))
     
     def normalize_phone(self, phone):
         """Normalize phone number for comparison"""
@@ -97,72 +129,128 @@ class ProfileComparator:
             return "Missing", 0.0
         
         # Normalize URLs
-        orig_clean = self.normalize_text(original_website.replace('http://', '').replace('https://', '').replace('www.', ''))
-        scraped_clean = self.normalize_text(scraped_website.replace('http://', '').replace('https://', '').replace('www.', ''))
+        orig_clean = self.normalize_website(original_website)
+        scraped_clean = self.normalize_website(scraped_website)
         
         if orig_clean == scraped_clean:
             return "Match", 1.0
         else:
             return "Mismatch", 0.0
     
+    def prepare_record(self, original_data):
+        """Normalize a roster record once so it can be compared against many profiles"""
+        if isinstance(original_data, PreparedRecord):
+            return original_data
+        return PreparedRecord(self, original_data)
+    
+    def _score_name(self, record, scraped_name, matcher, prune):
+        """Name status and score for a prepared record, with cheap shortcuts before the full ratio"""
+        if not record.name or not scraped_name:
+            return "Missing", 0.0
+        
+        normalized = self.normalize_text(scraped_name)
+        if not record.normalized_name or not normalized:
+            score = 0.0
+        elif normalized == record.normalized_name:
+            score = 1.0
+        else:
+            matcher.set_seq2(normalized)
+            # real_quick_ratio/quick_ratio are upper bounds on ratio(); when
+            # pruning, skip the full computation if the bound can't match
+            if prune and (matcher.real_quick_ratio() < self.name_threshold
+                          or matcher.quick_ratio() < self.name_threshold):
+                return "Mismatch", 0.0
+            score = matcher.ratio()
+        
+        return ("Match" if score >= self.name_threshold else "Mismatch"), score
+    
+    def _score_phone(self, record, scraped_phone):
+        """Phone status and score using the record's pre-normalized number"""
+        if not record.phone and not scraped_phone:
+            return "Missing", 1.0
+        
+        if not record.phone or not scraped_phone:
+            return "Missing", 0.0
+        
+        if record.normalized_phone == self.normalize_phone(scraped_phone):
+            return "Match", 1.0
+        return "Mismatch", 0.0
+    
+    def _score_website(self, record, scraped_website):
+        """Website status and score using the record's pre-normalized URL"""
+        if not record.website and not scraped_website:
+            return "Missing", 1.0
+        
+        if not record.website or not scraped_website:
+            return "Missing", 0.0
+        
+        if record.normalized_website == self.normalize_website(scraped_website):
+            return "Match", 1.0
+        return "Mismatch", 0.0
+    
+    def compare_many(self, original_data, scraped_profiles, prune=False):
+        """
+        Compare one roster record against many scraped profiles in a single call
+        original_data may be a dict/Series or a PreparedRecord, and each
+        scraped profile a dict or ScrapedProfile. With
+        prune=True, names whose cheap upper bound can't reach the match
+        threshold are reported as Mismatch with score 0.0 instead of their
+        exact ratio.
+        """
+        record = self.prepare_record(original_data)
+        
+        # The roster name stays the first sequence, as in similarity_score(),
+        # so every score matches compare_names() exactly
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(record.normalized_name)
+        
+        return [
+            self._compare_prepared(
+                record,
+                scraped_data if isinstance(scraped_data, ScrapedProfile) else ScrapedProfile.from_dict(scraped_data),
+                matcher, prune
+            )
+            for scraped_data in scraped_profiles
+        ]
+    
     def compare_profiles(self, original_data, scraped_data):
         """
         Compare complete profile data
-        Returns dict with comparison results for each field
+        Returns a ComparisonResult; its to_dict() gives the nested dict of
+        comparison results for each field. Only the name's match status is
+        needed here, so a name whose quick upper bound can't reach the
+        threshold is reported as Mismatch with score 0.0.
         """
-        results = {
-            'doctor_name': original_data.get('Name', ''),
-            'original_location': original_data.get('Location', ''),
-            'original_website': original_data.get('Website', ''),
-            'directory': scraped_data.get('directory', ''),
-            'profile_url': scraped_data.get('profile_url', ''),
-            'comparisons': {}
-        }
-        
+        return self.compare_many(original_data, [scraped_data], prune=True)[0]
+    
+    def _compare_prepared(self, record, scraped_data, matcher, prune):
+        """Build the comparison result for one scraped profile"""
         # Compare name
-        name_result, name_score = self.compare_names(
-            original_data.get('Name', ''),
-            scraped_data.get('name', '')
-        )
-        results['comparisons']['name'] = {
-            'status': name_result,
-            'score': name_score,
-            'original': original_data.get('Name', ''),
-            'scraped': scraped_data.get('name', '')
-        }
+        name_result, name_score = self._score_name(record, scraped_data.name, matcher, prune)
+        name = FieldComparison(name_result, name_score, record.name, scraped_data.name)
         
         # Compare phone (if original has phone data)
-        if 'Phone' in original_data:
-            phone_result, phone_score = self.compare_phones(
-                original_data.get('Phone', ''),
-                scraped_data.get('phone', '')
-            )
-            results['comparisons']['phone'] = {
-                'status': phone_result,
-                'score': phone_score,
-                'original': original_data.get('Phone', ''),
-                'scraped': scraped_data.get('phone', '')
-            }
+        phone = None
+        if record.has_phone:
+            phone_result, phone_score = self._score_phone(record, scraped_data.phone)
+            phone = FieldComparison(phone_result, phone_score, record.phone, scraped_data.phone)
         
         # Compare website
-        website_result, website_score = self.compare_websites(
-            original_data.get('Website', ''),
-            scraped_data.get('website', '')
+        website_result, website_score = self._score_website(record, scraped_data.website)
+        website = FieldComparison(website_result, website_score, record.website, scraped_data.website)
+        
+        # Other scraped fields are kept for reference
+        result = ComparisonResult(
+            record, scraped_data.directory, scraped_data.profile_url,
+            name=name, phone=phone, website=website,
+            scraped_address=scraped_data.address,
+            scraped_specialty=scraped_data.specialty,
+            has_photo=scraped_data.has_photo,
+            error=scraped_data.error
         )
-        results['comparisons']['website'] = {
-            'status': website_result,
-            'score': website_score,
-            'original': original_data.get('Website', ''),
-            'scraped': scraped_data.get('website', '')
-        }
-        
-        # Add other scraped fields for reference
-        results['scraped_address'] = scraped_data.get('address', '')
-        results['scraped_specialty'] = scraped_data.get('specialty', '')
-        results['has_photo'] = scraped_data.get('has_photo', False)
-        
-        # Calculate overall match score
-        scores = [comp['score'] for comp in results['comparisons'].values() if comp['score'] > 0]
-        results['overall_score'] = sum(scores) / len(scores) if scores else 0.0
-        
-        return results
\ No newline at end of file
+        
+        # Calculate overall match score; a failed scrape has nothing to score
+        scores = [comp.score for _, comp in result.comparisons() if comp.score > 0]
+        result.overall_score = sum(scores) / len(scores) if scores and result.error is None else 0.0
+        
+        return result
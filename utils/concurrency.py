@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+import logging
+from contextlib import contextmanager
+
+from config import (
+    CONCURRENCY_LIMITS, DEFAULT_CONCURRENCY_LIMIT, AIMD_DECREASE_FACTOR, AIMD_SLOW_RESPONSE_FACTOR,
+    RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, BLOCK_PAGE_MARKERS
+)
+from .metrics import get_metrics
+
+class Throttled(Exception):
+    """Raised when a host signals overload: timeout, 429/503 or a CAPTCHA page"""
+    
+    def __init__(self, reason, retry_after=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class SlotLease:
+    """A held slot in a host's window, timed from when it was taken"""
+    
+    __slots__ = ('window', 'started')
+    
+    def __init__(self, window):
+        self.window = window
+        self.started = time.monotonic()
+    
+    def restart_clock(self):
+        """Time the request from now, leaving out local setup done while holding the slot"""
+        self.started = time.monotonic()
+
+def looks_blocked(page_source, markers=BLOCK_PAGE_MARKERS):
+    """Check whether a page is an anti-bot interstitial instead of content"""
+    page = page_source[:200000].lower()
+    return any(marker in page for marker in markers)
+
+def parse_retry_after(value):
+    """Return a Retry-After header in seconds, or None if absent or a date"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+class DomainWindow:
+    """
+    AIMD concurrency window for one host.
+
+    Up to int(limit) requests may be in flight. Every success adds
+    1 / limit, so the window grows by one per window of successes; a
+    throttle signal or slow response multiplies it by the decrease factor,
+    at most once per window's worth of in-flight requests so one burst of
+    failures counts as a single congestion event.
+    """
+    
+    def __init__(self, initial, maximum, decrease_factor=AIMD_DECREASE_FACTOR,
+                 slow_factor=AIMD_SLOW_RESPONSE_FACTOR, minimum=1):
+        self.limit = float(initial)
+        self.maximum = float(maximum)
+        self.minimum = float(minimum)
+        self.decrease_factor = decrease_factor
+        self.slow_factor = slow_factor
+        
+        self.in_flight = 0
+        self.avg_latency = None
+        self.successes = 0
+        self.throttled = 0
+        self.slow = 0
+        self.retries = 0
+        
+        self._condition = threading.Condition()
+        self._started = 0
+        self._last_decrease = 0
+    
+    def acquire(self):
+        """Block until the window has room; returns the request's sequence number"""
+        with self._condition:
+            while self.in_flight >= max(1, int(self.limit)):
+                self._condition.wait()
+            self.in_flight += 1
+            self._started += 1
+            return self._started
+    
+    def _release(self):
+        self.in_flight -= 1
+        self._condition.notify_all()
+    
+    def _decrease(self, sequence):
+        # Requests started before the last cut saw the old window; don't cut again for them
+        if sequence <= self._last_decrease:
+            return
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        self._last_decrease = self._started
+    
+    def on_success(self, sequence, elapsed):
+        with self._condition:
+            self._release()
+            slow = (
+                self.avg_latency is not None and self.successes >= 5
+                and elapsed > self.avg_latency * self.slow_factor
+            )
+            self.avg_latency = elapsed if self.avg_latency is None else 0.875 * self.avg_latency + 0.125 * elapsed
+            self.successes += 1
+            
+            if slow:
+                self.slow += 1
+                self._decrease(sequence)
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+    
+    def on_throttled(self, sequence):
+        with self._condition:
+            self._release()
+            self.throttled += 1
+            self._decrease(sequence)
+    
+    def record_retry(self):
+        with self._condition:
+            self.retries += 1
+    
+    def on_other(self):
+        """Release a slot after an error that says nothing about host load"""
+        with self._condition:
+            self._release()
+    
+    def snapshot(self):
+        with self._condition:
+            return {
+                'window': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'max_window': self.maximum,
+                'avg_latency': self.avg_latency or 0.0,
+                'successes': self.successes,
+                'throttled': self.throttled,
+                'slow': self.slow,
+                'retries': self.retries
+            }
+
+class ConcurrencyScheduler:
+    """Per-host AIMD windows plus jittered retries, shared by search and scraping"""
+    
+    def __init__(self, limits=None, default_limit=DEFAULT_CONCURRENCY_LIMIT, max_attempts=RETRY_MAX_ATTEMPTS,
+                 base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        self.limits = dict(CONCURRENCY_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.logger = logging.getLogger(__name__)
+        
+        self._windows = {}
+        self._lock = threading.Lock()
+    
+    def normalize_host(self, host):
+        host = host.lower()
+        return host[4:] if host.startswith('www.') else host
+    
+    def get_limit(self, host):
+        """Return (initial, maximum) for a host, matching configured parent domains"""
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            limit = self.limits.get('.'.join(parts[i:]))
+            if limit is not None:
+                return limit
+        return self.default_limit
+    
+    def get_window(self, host):
+        """Return the window for a host, creating it on first use"""
+        host = self.normalize_host(host)
+        with self._lock:
+            window = self._windows.get(host)
+            if window is None:
+                initial, maximum = self.get_limit(host)
+                window = DomainWindow(initial, maximum)
+                self._windows[host] = window
+            return window
+    
+    @contextmanager
+    def slot(self, host):
+        """
+        Hold one of the host's in-flight slots for the duration of a request
+        Throttled exceptions shrink the window, clean exits grow it, and
+        other exceptions release the slot without a signal. Yields a
+        SlotLease whose clock sets the latency the window adapts to.
+        """
+        window = self.get_window(host)
+        with get_metrics().span('window_wait', domain=self.normalize_host(host)):
+            sequence = window.acquire()
+        lease = SlotLease(window)
+        try:
+            yield lease
+        except Throttled:
+            window.on_throttled(sequence)
+            raise
+        except BaseException:
+            window.on_other()
+            raise
+        else:
+            window.on_success(sequence, time.monotonic() - lease.started)
+    
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+    
+    def call(self, host, func, *args, **kwargs):
+        """Call func, retrying with backoff while it raises Throttled"""
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Throttled as e:
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    raise
+                
+                delay = self.backoff(attempt, e.retry_after)
+                window = self.get_window(host)
+                window.record_retry()
+                self.logger.warning(
+                    f"{host} throttled ({e.reason}), retry {attempt} in {delay:.1f}s "
+                    f"with window {window.limit:.1f}"
+                )
+                with get_metrics().span('backoff', domain=self.normalize_host(host)):
+                    time.sleep(delay)
+    
+    def snapshot(self):
+        """Return the live state of every host's window"""
+        with self._lock:
+            windows = dict(self._windows)
+        return {host: window.snapshot() for host, window in sorted(windows.items())}
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the process-wide concurrency scheduler, creating it on first use"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = ConcurrencyScheduler()
+        return _shared_scheduler
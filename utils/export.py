@@ -0,0 +1,219 @@
+"""
+Chunked writers for audit results: CSV, JSONL, Parquet and Excel.
+
+Every writer takes an open file and is fed one ComparisonResult at a time,
+so an export never builds a second full copy of the results in memory.
+CSV and JSONL rows go straight to the file; Parquet rows are buffered
+into row groups of EXPORT_CHUNK_ROWS, and Excel uses openpyxl's
+write-only mode, which streams rows to disk instead of keeping cells.
+"""
+import csv
+import json
+import os
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from config import EXPORT_CHUNK_ROWS, EXPORT_DIR
+from .audit_runner import flatten_result, RESULT_COLUMNS
+from .records import COMPARISON_FIELDS
+
+DETAIL_COLUMNS = ['Original Location']
+for _field in COMPARISON_FIELDS:
+    DETAIL_COLUMNS += [f"Original {_field.capitalize()}", f"{_field.capitalize()} Score"]
+
+# Display columns first, so existing consumers of the CSV keep working
+EXPORT_COLUMNS = RESULT_COLUMNS + DETAIL_COLUMNS
+
+EXPORT_SCHEMA = pa.schema([
+    (column, pa.float64() if column.endswith('Score') else pa.bool_() if column == 'Has Photo' else pa.string())
+    for column in EXPORT_COLUMNS
+])
+
+# Excel's sheet limit, less the header row
+XLSX_MAX_ROWS = 1048575
+
+def flatten_export_row(result):
+    """Flatten a comparison result into an export row with per-field detail"""
+    row = flatten_result(result)
+    row['Overall Score'] = round(result.overall_score, 4)
+    row['Has Photo'] = bool(result.has_photo)
+    row['Original Location'] = result.original_location
+    for field in COMPARISON_FIELDS:
+        comparison = getattr(result, field)
+        row[f"Original {field.capitalize()}"] = comparison.original if comparison else ''
+        row[f"{field.capitalize()} Score"] = comparison.score if comparison else None
+    return row
+
+class CsvExportWriter:
+    """Write export rows to CSV"""
+    
+    binary = False
+    
+    def __init__(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.f = f
+        self.writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+    
+    def write(self, result):
+        self.writer.writerow(flatten_export_row(result))
+    
+    def close(self):
+        self.f.flush()
+
+class JsonlExportWriter:
+    """Write full nested results, one JSON object per line"""
+    
+    binary = False
+    
+    def __init__(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.f = f
+    
+    def write(self, result):
+        self.f.write(json.dumps(result.to_dict(), default=str) + '\n')
+    
+    def close(self):
+        self.f.flush()
+
+class ParquetExportWriter:
+    """Write export rows to Parquet, one row group per chunk"""
+    
+    binary = True
+    
+    def __init__(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self.writer = pq.ParquetWriter(f, EXPORT_SCHEMA, compression='zstd')
+        self._rows = []
+    
+    def write(self, result):
+        self._rows.append(flatten_export_row(result))
+        if len(self._rows) >= self.chunk_rows:
+            self._flush()
+    
+    def _flush(self):
+        if self._rows:
+            self.writer.write_table(pa.Table.from_pylist(self._rows, schema=EXPORT_SCHEMA))
+            self._rows = []
+    
+    def close(self):
+        # Writes the footer, so a partial audit still leaves a readable file
+        self._flush()
+        self.writer.close()
+
+class XlsxExportWriter:
+    """Write export rows to an Excel workbook in write-only mode, continuing on a new sheet when one fills up"""
+    
+    binary = True
+    
+    def __init__(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        self.f = f
+        self.workbook = Workbook(write_only=True)
+        self.sheets = 0
+        self._new_sheet()
+    
+    def _new_sheet(self):
+        self.sheets += 1
+        self.sheet = self.workbook.create_sheet("Results" if self.sheets == 1 else f"Results {self.sheets}")
+        self.sheet.append(EXPORT_COLUMNS)
+        self.sheet_rows = 0
+    
+    def write(self, result):
+        if self.sheet_rows >= XLSX_MAX_ROWS:
+            self._new_sheet()
+        row = flatten_export_row(result)
+        self.sheet.append([row[column] for column in EXPORT_COLUMNS])
+        self.sheet_rows += 1
+    
+    def close(self):
+        self.workbook.save(self.f)
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'jsonl': JsonlExportWriter,
+    'parquet': ParquetExportWriter,
+    'xlsx': XlsxExportWriter,
+}
+
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+def open_export_file(path, output_format):
+    """Open a file for an export writer in the mode its format needs"""
+    if EXPORT_WRITERS[output_format].binary:
+        return open(path, 'wb')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+def export_results(results, f, output_format, chunk_rows=EXPORT_CHUNK_ROWS, progress=None):
+    """
+    Write results to an open file in the given format
+    progress, if given, is called with the number of rows written after
+    every chunk. Returns the number of rows written.
+    """
+    writer = EXPORT_WRITERS[output_format](f, chunk_rows)
+    rows = 0
+    for result in results:
+        writer.write(result)
+        rows += 1
+        if progress is not None and rows % chunk_rows == 0:
+            progress(rows)
+    writer.close()
+    
+    if progress is not None:
+        progress(rows)
+    return rows
+
+class ExportJob:
+    """
+    Export an audit's results to a file on a background thread.
+
+    The file is written under a temporary name and renamed when complete,
+    so a finished path is always a whole export. Progress is readable
+    from any thread while the export runs.
+    """
+    
+    def __init__(self, results, output_format, name, directory=EXPORT_DIR):
+        self.results = results
+        self.format = output_format
+        self.total = len(results)
+        self.path = os.path.join(directory, f"{name}.{output_format}")
+        self.rows_written = 0
+        self.error = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        partial_path = self.path + '.part'
+        try:
+            with open_export_file(partial_path, self.format) as f:
+                export_results(self.results, f, self.format, progress=self._set_progress)
+            os.replace(partial_path, self.path)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            # Results are only needed while writing
+            self.results = None
+            self._done.set()
+    
+    def _set_progress(self, rows):
+        self.rows_written = rows
+    
+    def done(self):
+        return self._done.is_set()
+    
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+    
+    @property
+    def mime_type(self):
+        return EXPORT_MIME_TYPES[self.format]
@@ -0,0 +1,256 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from config import JOB_QUEUE_PATH, JOB_QUEUE_WAL, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+from .checkpoint import doctor_key
+
+class Job:
+    """One (doctor, domain) unit of an audit, as claimed by a worker"""
+    
+    __slots__ = ('id', 'audit_id', 'doctor', 'domain', 'attempts')
+    
+    def __init__(self, id, audit_id, doctor, domain, attempts):
+        self.id = id
+        self.audit_id = audit_id
+        self.doctor = doctor
+        self.domain = domain
+        self.attempts = attempts
+
+class JobQueue:
+    """
+    Durable SQLite queue of (doctor, domain) audit jobs.
+
+    The UI or CLI enqueues an audit and polls its progress; any number of
+    worker processes claim jobs, run search/scrape/compare and write the
+    results back. A claim is a lease: a worker that dies or stops
+    heartbeating loses its jobs when the lease expires, and the next claim
+    picks them up again, until a job has used up its attempts. Completing
+    a job is only accepted from the worker holding its lease, so a slow
+    worker whose lease was taken over can't overwrite the new owner's work.
+    Claims, completions and failures each run in one IMMEDIATE
+    transaction, so workers on the same database never claim the same job.
+    """
+    
+    # Finished jobs are numbered in the order they finish, inside the write lock
+    _NEXT_SEQ = "(SELECT COALESCE(MAX(finished_seq), 0) + 1 FROM jobs)"
+    
+    def __init__(self, path=JOB_QUEUE_PATH, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS,
+                 wal=JOB_QUEUE_WAL):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Transactions are opened explicitly so claims can take the write lock up front
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        if wal:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " audit_id TEXT NOT NULL,"
+            " doctor_key TEXT NOT NULL,"
+            " doctor TEXT NOT NULL,"
+            " domain TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " results TEXT,"
+            " error TEXT,"
+            " finished_seq INTEGER,"
+            " updated_at REAL NOT NULL,"
+            " UNIQUE (audit_id, doctor_key, domain))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_audit ON jobs (audit_id, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_seq)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_audit_finished ON jobs (audit_id, finished_seq)")
+    
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def enqueue(self, audit_id, doctors, domains):
+        """
+        Add a job per (doctor, domain) of an audit
+        Re-submitting the same audit only adds jobs it doesn't already
+        have, so an interrupted submission can simply be repeated. Returns
+        the number of jobs added.
+        """
+        now = time.time()
+        rows = [
+            (audit_id, doctor_key(doctor), json.dumps(doctor, default=str), domain, now)
+            for doctor in doctors
+            for domain in domains
+        ]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (audit_id, doctor_key, doctor, domain, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            added = conn.total_changes - before
+        self.logger.info(f"Queued {added} jobs for audit {audit_id}")
+        return added
+    
+    def reset(self, audit_id):
+        """Drop every job of an audit so it can be submitted from scratch"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM jobs WHERE audit_id = ?", (audit_id,))
+    
+    def claim(self, worker):
+        """
+        Lease the next available job plus every other available job for the same doctor
+        Jobs for one doctor are claimed together so the worker can search
+        all of the doctor's directories in one combined query. Jobs that
+        have used up their attempts are marked failed instead. Returns an
+        empty list when nothing is available.
+        """
+        now = time.time()
+        available = "(status = 'pending' OR (status = 'leased' AND lease_expires < ?))"
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    f"SELECT audit_id, doctor_key FROM jobs WHERE {available} ORDER BY id LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    return []
+                
+                audit_id, key = row
+                rows = conn.execute(
+                    f"SELECT id, doctor, domain, attempts FROM jobs WHERE audit_id = ? AND doctor_key = ? AND {available}",
+                    (audit_id, key, now)
+                ).fetchall()
+                
+                exhausted = [job_id for job_id, _, _, attempts in rows if attempts >= self.max_attempts]
+                for job_id in exhausted:
+                    conn.execute(
+                        f"UPDATE jobs SET status = 'failed', worker = NULL, finished_seq = {self._NEXT_SEQ},"
+                        f" updated_at = ?, error = COALESCE(error, 'lease expired') WHERE id = ?",
+                        (now, job_id)
+                    )
+                
+                jobs = [
+                    Job(job_id, audit_id, json.loads(doctor), domain, attempts + 1)
+                    for job_id, doctor, domain, attempts in rows if attempts < self.max_attempts
+                ]
+                if not jobs:
+                    continue
+                
+                conn.executemany(
+                    "UPDATE jobs SET status = 'leased', worker = ?, attempts = ?, lease_expires = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    [(worker, job.attempts, now + self.lease_seconds, now, job.id) for job in jobs]
+                )
+                return jobs
+    
+    def heartbeat(self, worker, job_ids):
+        """Extend the worker's leases on the given jobs; returns the ids it still holds"""
+        if not job_ids:
+            return []
+        
+        now = time.time()
+        placeholders = ','.join('?' * len(job_ids))
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE jobs SET lease_expires = ?, updated_at = ?"
+                f" WHERE status = 'leased' AND worker = ? AND id IN ({placeholders})",
+                (now + self.lease_seconds, now, worker, *job_ids)
+            )
+            rows = conn.execute(
+                f"SELECT id FROM jobs WHERE status = 'leased' AND worker = ? AND id IN ({placeholders})",
+                (worker, *job_ids)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def complete(self, worker, job_id, results):
+        """Store a job's result dicts; returns False if the worker no longer held its lease"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = 'done', results = ?, error = NULL, lease_expires = NULL,"
+                f" finished_seq = {self._NEXT_SEQ}, updated_at = ?"
+                f" WHERE id = ? AND status = 'leased' AND worker = ?",
+                (json.dumps(results, default=str), time.time(), job_id, worker)
+            )
+            held = cursor.rowcount == 1
+        if not held:
+            self.logger.warning(f"Job {job_id} finished by {worker} after its lease passed to another worker")
+        return held
+    
+    def fail(self, worker, job_id, error):
+        """Release a job after an error: back to pending, or failed once its attempts are used up"""
+        with self._transaction() as conn:
+            conn.execute(
+                f"UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+                f" finished_seq = CASE WHEN attempts >= ? THEN {self._NEXT_SEQ} END,"
+                f" worker = NULL, lease_expires = NULL, error = ?, updated_at = ?"
+                f" WHERE id = ? AND status = 'leased' AND worker = ?",
+                (self.max_attempts, self.max_attempts, error, time.time(), job_id, worker)
+            )
+    
+    def progress(self, audit_id):
+        """Return job counts by status for an audit, plus the workers currently holding leases"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE audit_id = ? GROUP BY status", (audit_id,)
+            ).fetchall()
+            workers = self._conn.execute(
+                "SELECT COUNT(DISTINCT worker) FROM jobs WHERE audit_id = ? AND status = 'leased' AND lease_expires >= ?",
+                (audit_id, time.time())
+            ).fetchone()[0]
+        
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(rows))
+        counts['total'] = sum(count for status, count in rows)
+        counts['finished'] = counts['done'] + counts['failed']
+        counts['workers'] = workers
+        return counts
+    
+    def finished_jobs(self, audit_id, after=0):
+        """
+        Yield (sequence, doctor, domain, result dicts, error) for jobs finished after a sequence number
+        Jobs are numbered in the order they finished, so a poller can pass
+        the last sequence it saw to fetch only what finished since.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT finished_seq, doctor, domain, results, error FROM jobs"
+                " WHERE audit_id = ? AND finished_seq > ? ORDER BY finished_seq",
+                (audit_id, after)
+            ).fetchall()
+        
+        for sequence, doctor, domain, results, error in rows:
+            yield sequence, json.loads(doctor), domain, json.loads(results) if results else [], error
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+_shared_queue = None
+_shared_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Return the process-wide job queue, creating it on first use"""
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = JobQueue()
+        return _shared_queue
@@ -0,0 +1,98 @@
+import time
+from collections import deque
+
+from config import LIVE_RECENT_ROWS, LIVE_REFRESH_SECONDS
+from .audit_runner import flatten_result, is_failed
+from .records import NO_RESULTS_URL
+
+class LiveAuditResults:
+    """
+    Running view of an audit while it is still in progress.
+
+    Completed rows update the totals and per-directory counters as they
+    arrive, and only the most recent rows are kept flattened for display,
+    so the live view costs the same whether the roster has ten doctors or
+    fifty thousand. A directory whose rows are all errors shows up here
+    after its first few doctors instead of at the end of the run.
+    """
+    
+    def __init__(self, recent_rows=LIVE_RECENT_ROWS, refresh_seconds=LIVE_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.recent = deque(maxlen=recent_rows)
+        self.rows = 0
+        self.matches = 0
+        self.score_sum = 0.0
+        self.doctors = 0
+        self.failed_doctors = 0
+        self.domains = {}
+        self._last_refresh = None
+    
+    def add(self, results):
+        """Count one doctor's completed rows"""
+        self.doctors += 1
+        for result in results:
+            self.rows += 1
+            self.score_sum += result.overall_score
+            
+            counts = self.domains.get(result.directory)
+            if counts is None:
+                counts = self.domains[result.directory] = {
+                    'rows': 0, 'matches': 0, 'errors': 0, 'no_results': 0, 'last_error': ''
+                }
+            counts['rows'] += 1
+            
+            if result.name is not None and result.name.status == 'Match':
+                self.matches += 1
+                counts['matches'] += 1
+            
+            # Failed searches and scrapes count as errors; "not listed" doesn't
+            if is_failed(result):
+                counts['errors'] += 1
+                counts['last_error'] = result.error
+            elif result.profile_url == NO_RESULTS_URL:
+                counts['no_results'] += 1
+            
+            self.recent.append(flatten_result(result))
+    
+    def add_failure(self):
+        """Count a doctor whose processing raised instead of returning rows"""
+        self.doctors += 1
+        self.failed_doctors += 1
+    
+    def summary(self):
+        """Running totals for the summary metrics"""
+        return {
+            'rows': self.rows,
+            'matches': self.matches,
+            'avg_score': self.score_sum / self.rows if self.rows else 0.0,
+            'doctors': self.doctors,
+            'failed_doctors': self.failed_doctors
+        }
+    
+    def domain_health(self):
+        """Per-directory counts, worst error rate first"""
+        rows = [
+            {
+                'Directory': domain,
+                'Rows': counts['rows'],
+                'Matches': counts['matches'],
+                'Errors': counts['errors'],
+                'No Results': counts['no_results'],
+                'Error Rate': counts['errors'] / counts['rows'],
+                'Last Error': counts['last_error']
+            }
+            for domain, counts in self.domains.items()
+        ]
+        return sorted(rows, key=lambda row: row['Error Rate'], reverse=True)
+    
+    def recent_rows(self):
+        """The most recently completed rows, newest first"""
+        return list(reversed(self.recent))
+    
+    def should_refresh(self):
+        """Rate-limit redraws so fast audits don't flood the browser with updates"""
+        now = time.monotonic()
+        if self._last_refresh is not None and now - self._last_refresh < self.refresh_seconds:
+            return False
+        self._last_refresh = now
+        return True
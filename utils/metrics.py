@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+from config import METRICS_ENABLED, METRICS_BUCKETS, METRICS_RECENT_SPANS
+
+class Histogram:
+    """Fixed-bucket latency histogram in seconds"""
+    
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+    
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q):
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return 0.0
+        
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+    
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts))
+        }
+
+class MetricsRegistry:
+    """
+    Stage timings for an audit, aggregated per (stage, domain).
+
+    span() times a block and tags it with the stage, the domain and the
+    doctor. Tags set with context() apply to every span opened on the same
+    thread, so deep code doesn't need the doctor passed down. Histograms are
+    keyed by stage and domain only; per-doctor detail is kept for the most
+    recent spans so a slow doctor can still be found without unbounded
+    label cardinality.
+    """
+    
+    def __init__(self, enabled=METRICS_ENABLED, buckets=METRICS_BUCKETS, recent=METRICS_RECENT_SPANS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._recent = deque(maxlen=recent)
+        self._local = threading.local()
+    
+    def _tags(self):
+        tags = getattr(self._local, 'tags', None)
+        if tags is None:
+            tags = self._local.tags = {}
+        return tags
+    
+    @contextmanager
+    def context(self, **tags):
+        """Tag every span opened on this thread inside the block"""
+        current = self._tags()
+        saved = dict(current)
+        current.update(tags)
+        try:
+            yield
+        finally:
+            current.clear()
+            current.update(saved)
+    
+    @contextmanager
+    def span(self, stage, **tags):
+        """Time a block as one occurrence of a stage"""
+        if not self.enabled:
+            yield
+            return
+        
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, **tags)
+    
+    def observe(self, stage, seconds, **tags):
+        """Record a duration for a stage"""
+        if not self.enabled:
+            return
+        
+        merged = dict(self._tags())
+        merged.update(tags)
+        domain = merged.get('domain', '')
+        
+        with self._lock:
+            histogram = self._histograms.get((stage, domain))
+            if histogram is None:
+                histogram = self._histograms[(stage, domain)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            self._recent.append((stage, domain, merged.get('doctor', ''), seconds))
+    
+    def summary(self):
+        """Return per-stage totals across domains, slowest stage first"""
+        with self._lock:
+            stages = {}
+            for (stage, _), histogram in self._histograms.items():
+                stages.setdefault(stage, Histogram(self.buckets)).merge(histogram)
+        
+        rows = [
+            {
+                'stage': stage,
+                'count': histogram.count,
+                'total_seconds': histogram.sum,
+                'p50': histogram.quantile(0.5),
+                'p95': histogram.quantile(0.95),
+                'max': histogram.max
+            }
+            for stage, histogram in stages.items()
+        ]
+        return sorted(rows, key=lambda row: row['total_seconds'], reverse=True)
+    
+    def slowest(self, stage, limit=10):
+        """Return the slowest recent (domain, doctor, seconds) spans for a stage"""
+        with self._lock:
+            spans = [(domain, doctor, seconds) for name, domain, doctor, seconds in self._recent if name == stage]
+        return sorted(spans, key=lambda span: span[2], reverse=True)[:limit]
+    
+    def to_json(self):
+        """Export every histogram as a JSON document"""
+        with self._lock:
+            data = {
+                'stages': [
+                    dict(stage=stage, domain=domain, **histogram.to_dict())
+                    for (stage, domain), histogram in sorted(self._histograms.items())
+                ]
+            }
+        return json.dumps(data, indent=2)
+    
+    def to_prometheus(self):
+        """Export every histogram in the Prometheus text exposition format"""
+        lines = [
+            "# HELP audit_stage_seconds Time spent in each audit stage",
+            "# TYPE audit_stage_seconds histogram",
+        ]
+        with self._lock:
+            for (stage, domain), histogram in sorted(self._histograms.items()):
+                labels = f'stage="{stage}",domain="{domain}"'
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f'audit_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'audit_stage_seconds_sum{{{labels}}} {histogram.sum}')
+                lines.append(f'audit_stage_seconds_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+    
+    def reset(self):
+        """Forget every recorded span"""
+        with self._lock:
+            self._histograms.clear()
+            self._recent.clear()
+
+_shared_metrics = None
+_shared_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """Return the process-wide metrics registry, creating it on first use"""
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = MetricsRegistry()
+        return _shared_metrics
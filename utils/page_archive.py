@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import ARCHIVE_DIR
+
+class PageArchive:
+    """
+    Content-addressed archive of fetched profile pages.
+
+    Page bodies are stored gzip-compressed under their SHA-256 digest, so
+    identical pages are kept once. A SQLite index maps each URL and fetch
+    time to the digest that was served.
+    """
+    
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " domain TEXT NOT NULL,"
+            " tier TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        self._conn.commit()
+    
+    def object_path(self, digest):
+        """Return the file path for a page digest"""
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest[2:]}.html.gz")
+    
+    def store(self, url, page_source, domain, tier):
+        """
+        Archive a fetched page and return its digest
+        HTTP pages are stored as the raw response bytes so their own encoding
+        declaration still applies on replay; rendered browser pages are text.
+        """
+        body = page_source if isinstance(page_source, bytes) else page_source.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial object
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pages (url, fetched_at, digest, domain, tier) VALUES (?, ?, ?, ?, ?)",
+                (url, time.time(), digest, domain, tier)
+            )
+            self._conn.commit()
+        
+        return digest
+    
+    def read(self, digest):
+        """Return the raw bytes stored under a digest"""
+        with gzip.open(self.object_path(digest), 'rb') as f:
+            return f.read()
+    
+    def read_page(self, digest, tier):
+        """Return an archived page the way its tier fetched it: bytes for HTTP, text for the browser"""
+        body = self.read(digest)
+        return body.decode('utf-8') if tier == 'browser' else body
+    
+    def load_latest(self, url, before=None):
+        """Return the most recently archived page for a URL, or None"""
+        query = "SELECT digest, tier FROM pages WHERE url = ?"
+        params = [url]
+        if before is not None:
+            query += " AND fetched_at <= ?"
+            params.append(before)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+        
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+        return self.read_page(*row)
+    
+    def iter_latest(self, domain=None):
+        """Yield (url, domain, page_source) for the latest capture of every archived URL"""
+        query = (
+            "SELECT url, domain, digest, tier FROM pages p WHERE fetched_at = ("
+            " SELECT MAX(fetched_at) FROM pages WHERE url = p.url)"
+        )
+        params = []
+        if domain is not None:
+            query += " AND domain = ?"
+            params.append(domain)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for url, page_domain, digest, tier in rows:
+            yield url, page_domain, self.read_page(digest, tier)
+    
+    def close(self):
+        """Close the index connection"""
+        with self._lock:
+            self._conn.close()
+
+_shared_archive = None
+_shared_archive_lock = threading.Lock()
+
+def get_page_archive():
+    """Return the process-wide page archive, creating it on first use"""
+    global _shared_archive
+    with _shared_archive_lock:
+        if _shared_archive is None:
+            _shared_archive = PageArchive()
+        return _shared_archive
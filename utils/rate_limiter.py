@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import RATE_LIMITS, DEFAULT_RATE_LIMIT
+from .metrics import get_metrics
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to
+    `burst` requests. Callers reserve a token under a lock and then sleep
+    outside it, so waiters queue in arrival order and the long-run
+    throughput is exactly `rate`.
+    """
+    
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens=1):
+        """Take tokens now and return how many seconds the caller must wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            # Tokens may go negative: that debt is the queue of callers ahead of us
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self, tokens=1):
+        """Block the calling thread until tokens are available"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, tokens=1):
+        """Wait for tokens without blocking the event loop"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+class RateLimiter:
+    """Per-host token buckets shared by search and scraping"""
+    
+    def __init__(self, limits=None, default_limit=DEFAULT_RATE_LIMIT):
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    def normalize_host(self, host):
+        """Reduce a URL or netloc to the host key used for buckets"""
+        if '//' in host:
+            host = urlparse(host).netloc
+        host = host.lower().split(':')[0]
+        if host.startswith('www.'):
+            host = host[4:]
+        return host
+    
+    def get_limit(self, host):
+        """Return (rate, burst) for a host, matching configured parent domains"""
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            limit = self.limits.get('.'.join(parts[i:]))
+            if limit is not None:
+                return limit
+        return self.default_limit
+    
+    def get_bucket(self, host):
+        """Return the bucket for a host, creating it on first use"""
+        host = self.normalize_host(host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.get_limit(host)
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, host):
+        """Block until a request to this host (or URL) is allowed"""
+        with get_metrics().span('rate_limit_wait', domain=self.normalize_host(host)):
+            return self.get_bucket(host).acquire()
+    
+    async def acquire_async(self, host):
+        """Asyncio variant of acquire()"""
+        return await self.get_bucket(host).acquire_async()
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Return the process-wide rate limiter, creating it on first use"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
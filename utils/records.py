@@ -0,0 +1,181 @@
+"""
+Compact record types for scraped profiles and comparison results.
+
+Audit rows used to be nested dicts that repeated the roster values and
+every comparison's keys on each row. These classes use __slots__, point
+at the doctor's single roster record instead of copying its values, and
+intern the strings that repeat across rows (directories, statuses,
+specialties). to_dict() and from_dict() convert to and from the original
+dict shape for the checkpoint journal, JSONL output and older callers.
+"""
+import sys
+
+PROFILE_FIELDS = ('name', 'phone', 'address', 'website', 'specialty', 'has_photo')
+
+# Fields compared by ProfileComparator, in display order
+COMPARISON_FIELDS = ('name', 'phone', 'website')
+
+# Marker URL for a domain whose search returned nothing
+NO_RESULTS_URL = "No results found"
+
+# Marker URL for a domain whose search raised instead of returning results
+SEARCH_FAILED_URL = "Search failed"
+
+def intern_text(value):
+    """Intern a string that repeats across rows; other values pass through"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class RosterRecord:
+    """The roster values a result refers to, for results restored without their PreparedRecord"""
+    
+    __slots__ = ('name', 'location', 'website')
+    
+    def __init__(self, name, location, website):
+        self.name = name
+        self.location = location
+        self.website = website
+
+class ScrapedProfile:
+    """Fields scraped from one directory profile page"""
+    
+    __slots__ = PROFILE_FIELDS + ('directory', 'profile_url', 'error')
+    
+    def __init__(self, name='', phone='', address='', website='', specialty='', has_photo=False,
+                 directory='', profile_url='', error=None):
+        self.name = name
+        self.phone = phone
+        self.address = address
+        self.website = website
+        self.specialty = intern_text(specialty)
+        self.has_photo = has_photo
+        self.directory = intern_text(directory)
+        self.profile_url = profile_url
+        self.error = error
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a profile from a scraper's dict, ignoring keys it doesn't know"""
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+    
+    def replace(self, **changes):
+        """Return a copy of the profile with some fields changed"""
+        data = {field: getattr(self, field) for field in self.__slots__}
+        data.update(changes)
+        return ScrapedProfile(**data)
+    
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in PROFILE_FIELDS}
+        data['directory'] = self.directory
+        data['profile_url'] = self.profile_url
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+
+class FieldComparison:
+    """Status and score of one roster field against its scraped value"""
+    
+    __slots__ = ('status', 'score', 'original', 'scraped')
+    
+    def __init__(self, status, score, original, scraped):
+        self.status = intern_text(status)
+        self.score = score
+        self.original = original
+        self.scraped = scraped
+    
+    def to_dict(self):
+        return {'status': self.status, 'score': self.score, 'original': self.original, 'scraped': self.scraped}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['status'], data['score'], data['original'], data['scraped'])
+
+class ComparisonResult:
+    """
+    One audit row: a scraped profile compared against a roster record.
+
+    record is the doctor's PreparedRecord (or a RosterRecord), shared by
+    every row for that doctor. name, phone and website hold a
+    FieldComparison, or None when the field wasn't compared; phone is only
+    compared when the roster has a phone number, and rows that failed
+    before comparison have none.
+    """
+    
+    __slots__ = ('record', 'directory', 'profile_url', 'name', 'phone', 'website',
+                 'scraped_address', 'scraped_specialty', 'has_photo', 'overall_score', 'error')
+    
+    def __init__(self, record, directory, profile_url, name=None, phone=None, website=None,
+                 scraped_address='', scraped_specialty='', has_photo=False, overall_score=0.0, error=None):
+        self.record = record
+        self.directory = intern_text(directory)
+        self.profile_url = profile_url
+        self.name = name
+        self.phone = phone
+        self.website = website
+        self.scraped_address = scraped_address
+        self.scraped_specialty = intern_text(scraped_specialty)
+        self.has_photo = has_photo
+        self.overall_score = overall_score
+        self.error = error
+    
+    @property
+    def doctor_name(self):
+        return self.record.name
+    
+    @property
+    def original_location(self):
+        return self.record.location
+    
+    @property
+    def original_website(self):
+        return self.record.website
+    
+    def comparisons(self):
+        """Yield (field, FieldComparison) for every field that was compared"""
+        for field in COMPARISON_FIELDS:
+            comparison = getattr(self, field)
+            if comparison is not None:
+                yield field, comparison
+    
+    def to_dict(self):
+        """Return the nested dict shape compare_profiles() used to return"""
+        data = {
+            'doctor_name': self.doctor_name,
+            'original_location': self.original_location,
+            'original_website': self.original_website,
+            'directory': self.directory,
+            'profile_url': self.profile_url,
+            'comparisons': {field: comparison.to_dict() for field, comparison in self.comparisons()},
+            'scraped_address': self.scraped_address,
+            'scraped_specialty': self.scraped_specialty,
+            'has_photo': self.has_photo,
+            'overall_score': self.overall_score
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+    
+    @classmethod
+    def from_dict(cls, data, record=None):
+        """
+        Rebuild a result from its dict shape
+        Pass the doctor's record to share it; otherwise a RosterRecord is
+        built from the dict's own roster values.
+        """
+        if record is None:
+            record = RosterRecord(data['doctor_name'], data.get('original_location', ''),
+                                  data.get('original_website', ''))
+        
+        comparisons = data.get('comparisons', {})
+        fields = {
+            field: FieldComparison.from_dict(comparisons[field])
+            for field in COMPARISON_FIELDS if field in comparisons
+        }
+        return cls(
+            record, data['directory'], data['profile_url'],
+            scraped_address=data.get('scraped_address', ''),
+            scraped_specialty=data.get('scraped_specialty', ''),
+            has_photo=data.get('has_photo', False),
+            overall_score=data.get('overall_score', 0.0),
+            error=data.get('error'),
+            **fields
+        )
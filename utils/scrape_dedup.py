@@ -0,0 +1,99 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config import SCRAPE_DEDUP_MAX_ENTRIES
+from .url_canonical import canonicalize_url
+
+class SingleFlightScrapes:
+    """
+    Audit-wide single-flight cache of scraped profiles.
+
+    The first request for a canonical URL fetches it; concurrent requests
+    for the same URL wait on that fetch, and later ones reuse its result,
+    so a profile that turns up for several doctors or query variants is
+    scraped once and fanned out to every row that needs it. Failed scrapes
+    are handed to whoever was waiting but not kept, so the next request
+    retries. Completed entries are evicted least recently used first.
+    Every requester gets its own copy of the result, carrying the URL it
+    asked for, so rows never share or overwrite one profile object.
+    """
+    
+    def __init__(self, max_entries=SCRAPE_DEDUP_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.fetches = 0
+        self.reused = 0
+        self.joined = 0
+    
+    def get(self, url, fetch):
+        """Return fetch(url)'s result, sharing it with every request for the same canonical URL"""
+        key = canonicalize_url(url)
+        
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                self.fetches += 1
+            else:
+                self._entries.move_to_end(key)
+                if future.done():
+                    self.reused += 1
+                else:
+                    self.joined += 1
+        
+        if not owner:
+            return self._for_request(future.result(), url)
+        
+        try:
+            result = fetch(url)
+        except BaseException as e:
+            with self._lock:
+                self._entries.pop(key, None)
+            future.set_exception(e)
+            raise
+        
+        # Scrapers return dicts; the audit wraps them in ScrapedProfile records
+        error = result.get('error') if isinstance(result, dict) else getattr(result, 'error', None)
+        with self._lock:
+            if error:
+                self._entries.pop(key, None)
+            self._evict()
+        future.set_result(result)
+        return self._for_request(result, url)
+    
+    def _for_request(self, result, url):
+        """Copy a shared result for one requester, pointing it at the URL that requester asked for"""
+        if isinstance(result, dict):
+            return dict(result, profile_url=url)
+        return result.replace(profile_url=url)
+    
+    def _evict(self):
+        """Drop the oldest completed entries beyond the size limit; caller holds the lock"""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        
+        for key in list(self._entries):
+            if excess <= 0:
+                break
+            if self._entries[key].done():
+                del self._entries[key]
+                excess -= 1
+    
+    def stats(self):
+        """Return how many scrapes were performed and how many were shared"""
+        with self._lock:
+            requests = self.fetches + self.reused + self.joined
+            return {
+                'fetches': self.fetches,
+                'reused': self.reused,
+                'joined': self.joined,
+                'dedup_rate': (self.reused + self.joined) / requests if requests else 0.0
+            }
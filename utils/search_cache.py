@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import (
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_NEGATIVE_TTL,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TIMEOUT
+)
+
+class SearchCache:
+    """On-disk SQLite cache of search results keyed by normalized query"""
+    
+    def __init__(self, path=SEARCH_CACHE_PATH, ttl=SEARCH_CACHE_TTL,
+                 negative_ttl=SEARCH_CACHE_NEGATIVE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES,
+                 timeout=SEARCH_CACHE_TIMEOUT):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Several UI sessions and workers share the file; wait briefly for a writer instead of failing at once
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=timeout)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " query TEXT PRIMARY KEY,"
+            " urls TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed_at)"
+        )
+        self._conn.commit()
+    
+    def normalize_query(self, query):
+        """Lowercase and collapse whitespace so trivially different queries share an entry"""
+        return ' '.join(str(query).lower().split())
+    
+    def get(self, query, ignore_ttl=False):
+        """Return cached URLs for a query, or None on a miss or expired entry"""
+        key = self.normalize_query(query)
+        now = time.time()
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls, created_at FROM search_cache WHERE query = ?", (key,)
+            ).fetchone()
+            
+            urls = None
+            if row is not None:
+                cached_urls = json.loads(row[0])
+                # Empty results are cached too, but expire sooner
+                ttl = self.ttl if cached_urls else self.negative_ttl
+                if ignore_ttl or now - row[1] <= ttl:
+                    urls = cached_urls
+                    self._conn.execute(
+                        "UPDATE search_cache SET accessed_at = ? WHERE query = ?", (now, key)
+                    )
+                    self._conn.commit()
+            
+            if urls is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            hits, misses = self.hits, self.misses
+        
+        status = "hit" if urls is not None else "miss"
+        self.logger.info(f"Search cache {status} ({hits} hits / {misses} misses): {key}")
+        return urls
+    
+    def put(self, query, urls):
+        """Store the URLs returned for a query, evicting least recently used entries past the size bound"""
+        key = self.normalize_query(query)
+        now = time.time()
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (query, urls, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(urls)), now, now)
+            )
+            
+            count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+            if self.max_entries and count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM search_cache WHERE query IN ("
+                    " SELECT query FROM search_cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+    
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_search_cache():
+    """Return the process-wide search cache, creating it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache()
+        return _shared_cache
\ No newline at end of file
@@ -1,16 +1,100 @@
 from googlesearch import search
-import time
+import requests
 import logging
 from urllib.parse import urlparse
 
+from config import (
+    SEARCH_HOST, SEARCH_CACHE_ENABLED, ARCHIVE_MODE, SEARCH_COMBINE_DOMAINS, SEARCH_MAX_SITES_PER_QUERY,
+    SEARCH_MAX_QUERY_WORDS
+)
+from .rate_limiter import get_rate_limiter
+from .search_cache import get_search_cache
+from .concurrency import get_scheduler, Throttled, parse_retry_after
+from .metrics import get_metrics
+
 class SearchEngine:
     """Handle Google searches for doctor profiles"""
     
-    def __init__(self, max_results=3, delay=1):
+    def __init__(self, max_results=3, rate_limiter=None, cache=None, use_cache=SEARCH_CACHE_ENABLED,
+                 offline=ARCHIVE_MODE == 'replay', scheduler=None, search_backend=None,
+                 combine_domains=SEARCH_COMBINE_DOMAINS, max_sites_per_query=SEARCH_MAX_SITES_PER_QUERY,
+                 max_query_words=SEARCH_MAX_QUERY_WORDS):
         self.max_results = max_results
-        self.delay = delay
+        self.combine_domains = combine_domains
+        self.max_sites_per_query = max_sites_per_query
+        self.max_query_words = max_query_words
+        # Anything with googlesearch.search's (query, num_results=...) signature
+        self.search_backend = search_backend or search
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.scheduler = scheduler or get_scheduler()
+        self.cache = cache if cache is not None or not use_cache else get_search_cache()
+        # Offline engines (archive replay) answer from the cache only, however stale
+        self.offline = offline
         self.logger = logging.getLogger(__name__)
     
+    def run_search(self, query, num_results=None):
+        """Run one search query, raising Throttled when the search host pushes back"""
+        num_results = num_results or self.max_results
+        
+        # Perform search once the shared search bucket allows it
+        self.rate_limiter.acquire(SEARCH_HOST)
+        search_results = []
+        with self.scheduler.slot(SEARCH_HOST):
+            try:
+                for url in self.search_backend(query, num_results=num_results):
+                    search_results.append(url)
+                    if len(search_results) >= num_results:
+                        break
+            except requests.Timeout as e:
+                raise Throttled(f"timeout: {str(e)}")
+            except requests.HTTPError as e:
+                response = e.response
+                if response is not None and response.status_code in (429, 503):
+                    raise Throttled(
+                        f"status {response.status_code}", parse_retry_after(response.headers.get('Retry-After'))
+                    )
+                raise
+        return search_results
+    
+    def build_query(self, doctor_name, location, domains):
+        """Build a search query restricted to one or more domains"""
+        sites = ' OR '.join(f'site:{domain}' for domain in domains)
+        return f'{sites} "{doctor_name}" {location}'
+    
+    def domain_matches(self, url, domain):
+        """Check whether a search result URL is from the given domain"""
+        return domain.lower() in urlparse(url).netloc.lower()
+    
+    def group_domains(self, doctor_name, location, domains):
+        """Split domains into groups small enough for one combined query each"""
+        groups = []
+        for domain in domains:
+            if groups and len(groups[-1]) < self.max_sites_per_query and \
+                    len(self.build_query(doctor_name, location, groups[-1] + [domain]).split()) <= self.max_query_words:
+                groups[-1].append(domain)
+            else:
+                groups.append([domain])
+        return groups
+    
+    def cache_get(self, cache_key):
+        """Look a query up in the cache; a cache error is logged and treated as a miss"""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(cache_key, ignore_ttl=self.offline)
+        except Exception as e:
+            self.logger.warning(f"Search cache read failed, searching instead: {str(e)}")
+            return None
+    
+    def cache_put(self, cache_key, urls):
+        """Store a completed search; caching is best effort and never fails the search"""
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(cache_key, urls)
+        except Exception as e:
+            self.logger.warning(f"Search cache write failed: {str(e)}")
+    
     def search_doctor_on_domain(self, doctor_name, location, domain):
         """
         Search for a doctor on a specific domain
@@ -18,43 +102,109 @@ class SearchEngine:
         """
         try:
             # Construct search query
-            query = f'site:{domain} "{doctor_name}" {location}'
+            query = self.build_query(doctor_name, location, [domain])
+            
+            # Result counts are part of the key so raising max_results isn't served short lists
+            cache_key = f'{query} num:{self.max_results}'
+            cached_results = self.cache_get(cache_key)
+            if cached_results is not None:
+                return cached_results
+            
+            if self.offline:
+                self.logger.info(f"Offline, skipping uncached search: {query}")
+                return []
+            
             self.logger.info(f"Searching: {query}")
             
-            # Perform search
-            search_results = []
-            for url in search(query, num_results=self.max_results, sleep_interval=self.delay):
-                search_results.append(url)
-                if len(search_results) >= self.max_results:
-                    break
+            # Throttled searches back off and retry under the search host's window
+            with get_metrics().span('search', domain=domain):
+                search_results = self.scheduler.call(SEARCH_HOST, self.run_search, query)
             
             # Filter results to ensure they're from the correct domain
-            filtered_results = []
-            for url in search_results:
-                parsed_url = urlparse(url)
-                if domain.lower() in parsed_url.netloc.lower():
-                    filtered_results.append(url)
+            filtered_results = [url for url in search_results if self.domain_matches(url, domain)]
             
             self.logger.info(f"Found {len(filtered_results)} results for {doctor_name} on {domain}")
-            return filtered_results
             
+            # Only completed searches are cached; errors below are retried next time
+            self.cache_put(cache_key, filtered_results)
+            return filtered_results
+        
         except Exception as e:
+            # Raised rather than returned as [], so a failed search isn't mistaken for "not listed"
             self.logger.error(f"Search error for {doctor_name} on {domain}: {str(e)}")
-            return []
+            raise
+    
+    def search_doctor_on_domains(self, doctor_name, location, domains):
+        """
+        Search for a doctor on several domains with one OR'ed site: query
+        Asks for max_results per domain and partitions the returned URLs by
+        netloc. Returns dict with domain as key and list of URLs as value;
+        a domain the query found nothing on maps to an empty list.
+        """
+        try:
+            query = self.build_query(doctor_name, location, domains)
+            num_results = self.max_results * len(domains)
+            
+            cache_key = f'{query} num:{num_results}'
+            search_results = self.cache_get(cache_key)
+            
+            if search_results is None:
+                if self.offline:
+                    self.logger.info(f"Offline, skipping uncached search: {query}")
+                    return {domain: [] for domain in domains}
+                
+                self.logger.info(f"Searching: {query}")
+                with get_metrics().span('search', domain='combined'):
+                    search_results = self.scheduler.call(SEARCH_HOST, self.run_search, query, num_results)
+                
+                # The raw results are cached; partitioning is cheap to redo
+                self.cache_put(cache_key, search_results)
+            
+            partitioned = {
+                domain: [url for url in search_results if self.domain_matches(url, domain)][:self.max_results]
+                for domain in domains
+            }
+            self.logger.info(
+                f"Found {sum(len(urls) for urls in partitioned.values())} results for {doctor_name} "
+                f"on {len(domains)} domains with one query"
+            )
+            return partitioned
+        
+        except Exception as e:
+            # An empty partition means "not listed"; a failed query must not look like one
+            self.logger.error(f"Combined search error for {doctor_name}: {str(e)}")
+            raise
     
     def search_doctor_all_domains(self, doctor_name, location, domains):
         """
         Search for a doctor across multiple domains
         Returns dict with domain as key and list of URLs as value
+        With combine_domains, domains are searched in OR'ed groups and only
+        the domains a group's query found nothing on get their own query.
+        A query that fails (e.g. Throttled after its retries) raises instead
+        of being retried once per domain against the host that refused it.
         """
         all_results = {}
         
+        if not self.combine_domains or len(domains) < 2:
+            for domain in domains:
+                self.logger.info(f"Searching {domain} for {doctor_name}")
+                urls = self.search_doctor_on_domain(doctor_name, location, domain)
+                all_results[domain] = urls
+            return all_results
+        
+        searched_alone = set()
+        for group in self.group_domains(doctor_name, location, list(domains)):
+            if len(group) == 1:
+                all_results[group[0]] = self.search_doctor_on_domain(doctor_name, location, group[0])
+                searched_alone.add(group[0])
+            else:
+                all_results.update(self.search_doctor_on_domains(doctor_name, location, group))
+        
+        # A combined query that succeeded can miss a domain the engine ranked below the others
         for domain in domains:
-            self.logger.info(f"Searching {domain} for {doctor_name}")
-            urls = self.search_doctor_on_domain(doctor_name, location, domain)
-            all_results[domain] = urls
-            
-            # Be respectful with search requests
-            time.sleep(self.delay)
+            if not all_results[domain] and domain not in searched_alone:
+                self.logger.info(f"Combined search found nothing on {domain}, searching it alone")
+                all_results[domain] = self.search_doctor_on_domain(doctor_name, location, domain)
         
-        return all_results
\ No newline at end of file
+        return {domain: all_results[domain] for domain in domains}
@@ -0,0 +1,40 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'ref_src', 'srsltid',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+def canonicalize_url(url):
+    """
+    Reduce a profile URL to one canonical form
+    Lowercases the scheme and host, drops "www.", default ports, the
+    fragment, tracking parameters and any trailing slash, and sorts the
+    remaining query parameters, so variants of the same page compare equal.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = host
+    if parts.port is not None and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    
+    path = parts.path.rstrip('/') or '/'
+    
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    ))
+    
+    return urlunsplit((scheme, netloc, path, query, ''))
@@ -0,0 +1,188 @@
+"""
+Queue worker: claim audit jobs from the shared job queue and run them.
+
+    python worker.py
+    python worker.py --queue /srv/audits/jobs.sqlite3 --doctor-workers 8
+    python worker.py --exit-when-idle
+
+Audits submitted from the UI with "Run on background workers" are split
+into one job per (doctor, directory). A worker leases every open job of
+a doctor at once, so the doctor's directories still share one combined
+search and stop early on a good match, then writes each directory's rows
+back to its job. Leases are renewed while the work runs; when a worker
+dies its jobs are picked up by another worker once the leases expire.
+Start as many workers as the directories' rate limits allow.
+"""
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import MAX_SEARCH_RESULTS, MAX_DOCTOR_WORKERS, MAX_SCRAPE_WORKERS, JOB_QUEUE_PATH, JOB_POLL_SECONDS
+from utils.search_engine import SearchEngine
+from utils.comparison import ProfileComparator
+from utils.scrape_dedup import SingleFlightScrapes
+from utils.job_queue import JobQueue
+from utils.audit_runner import process_doctor_profile, is_failed
+from utils.metrics import get_metrics
+
+logger = logging.getLogger("worker")
+
+class QueueWorker:
+    """Claim jobs from a JobQueue and run them on local thread pools"""
+    
+    def __init__(self, queue, worker_id, doctor_workers=MAX_DOCTOR_WORKERS, scrape_workers=MAX_SCRAPE_WORKERS,
+                 poll_seconds=JOB_POLL_SECONDS, search_engine=None, comparator=None):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.doctor_workers = doctor_workers
+        self.scrape_workers = scrape_workers
+        self.poll_seconds = poll_seconds
+        self.search_engine = search_engine or SearchEngine(max_results=MAX_SEARCH_RESULTS)
+        self.comparator = comparator or ProfileComparator()
+        self.scrapes = SingleFlightScrapes()
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        
+        # Job ids this worker holds leases on, renewed by the heartbeat thread
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Leases are renewed until the last in-flight doctor is written back, not just until stop()
+        self._stop_heartbeat = threading.Event()
+    
+    def _heartbeat(self):
+        interval = self.queue.lease_seconds / 3
+        while not self._stop_heartbeat.wait(interval):
+            with self._held_lock:
+                job_ids = list(self._held)
+            try:
+                still_held = set(self.queue.heartbeat(self.worker_id, job_ids))
+            except Exception as e:
+                logger.error(f"Lease renewal failed: {str(e)}")
+                continue
+            lost = [job_id for job_id in job_ids if job_id not in still_held]
+            if lost:
+                logger.warning(f"Lost leases on jobs {lost}; their results will be discarded")
+    
+    def run_jobs(self, jobs, scrape_executor):
+        """
+        Run one doctor's claimed jobs and write each directory's rows back to its job
+        A job whose rows include a failed search or scrape is released for
+        another attempt; on its last attempt the rows are kept, errors and all.
+        """
+        doctor = jobs[0].doctor
+        try:
+            results = process_doctor_profile(
+                doctor, [job.domain for job in jobs], self.search_engine, self.comparator,
+                scrape_executor, None, self.scrapes
+            )
+        except Exception as e:
+            logger.error(f"Error processing {doctor['Name']}: {str(e)}")
+            for job in jobs:
+                self.queue.fail(self.worker_id, job.id, str(e))
+            with self._held_lock:
+                self.jobs_failed += len(jobs)
+            return
+        
+        for job in jobs:
+            job_results = [result for result in results if result.directory == job.domain]
+            failed = [result for result in job_results if is_failed(result)]
+            if failed and job.attempts < self.queue.max_attempts:
+                self.queue.fail(self.worker_id, job.id, failed[0].error)
+                with self._held_lock:
+                    self.jobs_failed += 1
+            elif self.queue.complete(self.worker_id, job.id, [result.to_dict() for result in job_results]):
+                with self._held_lock:
+                    self.jobs_done += 1
+    
+    def _release(self, jobs):
+        with self._held_lock:
+            self._held.difference_update(job.id for job in jobs)
+    
+    def run(self, exit_when_idle=False):
+        """
+        Claim and run jobs until stopped
+        Up to doctor_workers doctors are in flight at once. With
+        exit_when_idle the worker returns once the queue has nothing left
+        to claim and its own jobs are finished; otherwise it keeps polling.
+        """
+        heartbeat = threading.Thread(target=self._heartbeat, daemon=True)
+        heartbeat.start()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.doctor_workers) as doctor_executor, \
+                    ThreadPoolExecutor(max_workers=self.scrape_workers) as scrape_executor:
+                in_flight = {}
+                while not self._stop.is_set():
+                    while len(in_flight) < self.doctor_workers:
+                        jobs = self.queue.claim(self.worker_id)
+                        if not jobs:
+                            break
+                        with self._held_lock:
+                            self._held.update(job.id for job in jobs)
+                        in_flight[doctor_executor.submit(self.run_jobs, jobs, scrape_executor)] = jobs
+                    
+                    if not in_flight:
+                        if exit_when_idle:
+                            break
+                        time.sleep(self.poll_seconds)
+                        continue
+                    
+                    done, _ = wait(in_flight, timeout=self.poll_seconds, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._release(in_flight.pop(future))
+                    
+                    if done:
+                        logger.info(f"{self.jobs_done} jobs done, {self.jobs_failed} failed, {len(in_flight)} doctors in flight")
+        finally:
+            # The executors have drained by now, so nothing is left to renew
+            self._stop.set()
+            self._stop_heartbeat.set()
+        
+        return self.jobs_done, self.jobs_failed
+    
+    def stop(self):
+        """Stop claiming new jobs; doctors already in flight are finished first"""
+        self._stop.set()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run audit jobs from the shared job queue")
+    parser.add_argument("--queue", default=JOB_QUEUE_PATH, help="Job queue database shared with the UI")
+    parser.add_argument("--worker-id", help="Name recorded on leased jobs (default: host:pid)")
+    parser.add_argument("--doctor-workers", type=int, default=MAX_DOCTOR_WORKERS, help="Doctors processed in parallel")
+    parser.add_argument("--scrape-workers", type=int, default=MAX_SCRAPE_WORKERS, help="Concurrent profile scrapes")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Exit once the queue has no jobs left")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    args = parse_args(argv)
+    
+    worker_id = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(args.queue)
+    worker = QueueWorker(queue, worker_id, doctor_workers=args.doctor_workers, scrape_workers=args.scrape_workers)
+    
+    logger.info(f"Worker {worker_id} polling {args.queue}")
+    try:
+        jobs_done, jobs_failed = worker.run(exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        logger.info("Interrupted; unfinished jobs return to the queue when their leases expire")
+        return 130
+    finally:
+        queue.close()
+    
+    logger.info(f"Worker {worker_id} finished: {jobs_done} jobs done, {jobs_failed} failed")
+    for row in get_metrics().summary():
+        logger.info(
+            f"{row['stage']}: {row['count']} spans, {row['total_seconds']:.1f}s total, "
+            f"p50 {row['p50'] * 1000:.0f} ms, p95 {row['p95'] * 1000:.0f} ms"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())